@@ -0,0 +1,123 @@
+"""
+Compares ways of writing downloaded file to disk:
+
+* ``aiofiles``: ``await fd.write(chunk)`` for every chunk, one thread handoff per chunk (previous behaviour)
+* ``batched``: FileSink coalescing chunks into batches written by dedicated thread with ``os.pwrite``
+
+Server runs in separate process, so CPU time is spent by client only.
+
+Usage: python benchmarks/downloads.py [--size-mb N] [--repeat N] [--dir PATH]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import tempfile
+import time
+
+import aiofiles
+from aiohttp import web
+
+from pydantic_aiohttp import Client
+from pydantic_aiohttp import StreamResponseClass
+from pydantic_aiohttp.utils import DEFAULT_DOWNLOAD_CHUNK_SIZE
+
+
+class AiofilesStreamResponseClass(StreamResponseClass):
+    async def parse(self, *args, filepath, chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE, **kwargs):
+        async with aiofiles.open(filepath, 'wb') as fd:
+            async for chunk in self.aiohttp_response.content.iter_chunked(chunk_size):
+                await fd.write(chunk)
+
+        return filepath
+
+
+def serve(port: int, size: int):
+    body = os.urandom(1024 * 1024) * (size // (1024 * 1024))
+
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(body=body, content_type='application/octet-stream')
+
+    app = web.Application()
+    app.router.add_get('/file', handler)
+    web.run_app(app, host='127.0.0.1', port=port, print=None)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_server(port: int):
+    for _ in range(100):
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+        except OSError:
+            await asyncio.sleep(0.1)
+        else:
+            writer.close()
+            return
+
+    raise RuntimeError('server did not start')
+
+
+async def measure(client: Client, filepath: str, repeat: int, **kwargs) -> tuple[float, float]:
+    best_wall = best_cpu = float('inf')
+
+    for _ in range(repeat):
+        started_wall, started_cpu = time.perf_counter(), time.process_time()
+        await client.request('GET', '/file', filepath=filepath, use_cache=False, **kwargs)
+        best_wall = min(best_wall, time.perf_counter() - started_wall)
+        best_cpu = min(best_cpu, time.process_time() - started_cpu)
+        os.remove(filepath)
+
+    return best_wall, best_cpu
+
+
+async def run(port: int, size: int, repeat: int, directory: str):
+    await wait_for_server(port)
+    filepath = os.path.join(directory, 'download.bin')
+    strategies = [
+        ('aiofiles', {'response_class': AiofilesStreamResponseClass}),
+        *(
+            (f'batched {batch_size // (1024 * 1024)}MB', {
+                'response_class': StreamResponseClass,
+                'write_batch_size': batch_size
+            })
+            for batch_size in (4 * 1024 * 1024, 8 * 1024 * 1024, 16 * 1024 * 1024)
+        ),
+    ]
+
+    print(f"{'strategy':>14} {'MB/s':>10} {'CPU s/GB':>10}")
+
+    async with Client(f'http://127.0.0.1:{port}') as client:
+        for name, kwargs in strategies:
+            wall, cpu = await measure(client, filepath, repeat, **kwargs)
+            gigabytes = size / 1024 ** 3
+            print(f"{name:>14} {size / 1024 / 1024 / wall:>10.1f} {cpu / gigabytes:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size-mb', type=int, default=512)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--dir', default=None, help='directory for downloaded file, temporary one by default')
+    args = parser.parse_args()
+
+    port = free_port()
+    size = args.size_mb * 1024 * 1024
+    server = multiprocessing.Process(target=serve, args=(port, size), daemon=True)
+    server.start()
+
+    try:
+        with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+            asyncio.run(run(port, size, args.repeat, directory))
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Micro-benchmark of jsonable_encoder and url_compatible_encoder on nested payloads.
+
+Usage: python benchmarks/encoders.py [--repeat N]
+"""
+import argparse
+import dataclasses
+import datetime
+import time
+import uuid
+from decimal import Decimal
+from enum import Enum
+
+from pydantic_aiohttp.encoders import jsonable_encoder
+from pydantic_aiohttp.encoders import url_compatible_encoder
+
+
+class Status(Enum):
+    ACTIVE = 'active'
+    DISABLED = 'disabled'
+
+
+@dataclasses.dataclass
+class Address:
+    city: str
+    street: str
+    building: int
+
+
+@dataclasses.dataclass
+class User:
+    id: uuid.UUID
+    name: str
+    status: Status
+    balance: Decimal
+    created_at: datetime.datetime
+    addresses: list[Address]
+
+
+def make_payloads() -> dict[str, object]:
+    created_at = datetime.datetime(2024, 1, 1, 12, 0, 0)
+    return {
+        'wide dict': {f"key_{i}": i for i in range(10_000)},
+        'nested dict/list': {
+            f"group_{i}": [{"id": j, "name": f"n{j}", "tags": ["a", "b"], "score": j / 3} for j in range(100)]
+            for i in range(50)
+        },
+        'dataclasses': [
+            User(
+                id=uuid.UUID(int=i),
+                name=f"user {i}",
+                status=Status.ACTIVE,
+                balance=Decimal(i) / 100,
+                created_at=created_at,
+                addresses=[Address("City", "Street", j) for j in range(3)],
+            )
+            for i in range(2_000)
+        ],
+        'query params': {"page": 1, "per_page": 100, "active": True, "ids": list(range(50)), "q": "search"},
+    }
+
+
+def best_of(repeat: int, func, obj) -> float:
+    timings = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(obj)
+        timings.append(time.perf_counter() - started)
+
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'payload':>18} {'jsonable, ms':>13} {'url, ms':>10}")
+
+    for name, payload in make_payloads().items():
+        jsonable = best_of(args.repeat, jsonable_encoder, payload)
+        url = best_of(args.repeat, url_compatible_encoder, payload)
+        print(f"{name:>18} {jsonable * 1000:>13.3f} {url * 1000:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Encode/decode matrix for every installed JSON backend.
+
+* ``plain``: only JSON native values
+* ``rich``: datetimes, UUIDs, Decimals and Enums which go through ``default`` hook
+  unless backend serializes them natively
+
+Usage: python benchmarks/json_backends.py [--items N] [--repeat N]
+"""
+import argparse
+import datetime
+import time
+import uuid
+from decimal import Decimal
+from enum import Enum
+
+from pydantic_aiohttp.encoders import jsonable_encoder
+from pydantic_aiohttp.json_backends import available_json_backends
+
+
+class Status(Enum):
+    ACTIVE = 'active'
+    DISABLED = 'disabled'
+
+
+def make_payloads(items: int) -> dict[str, list[dict]]:
+    now = datetime.datetime(2024, 1, 1, 12, 30, 15, 123456)
+    plain = [
+        {"id": i, "name": f"item-{i}", "price": i * 0.5, "tags": ["a", "b"], "active": True}
+        for i in range(items)
+    ]
+    rich = [
+        {
+            "id": uuid.UUID(int=i),
+            "created_at": now + datetime.timedelta(seconds=i),
+            "price": Decimal(i) / 4,
+            "status": Status.ACTIVE,
+        }
+        for i in range(items)
+    ]
+    return {'plain': plain, 'rich': rich}
+
+
+def best_of(repeat: int, func, *args, **kwargs) -> float:
+    timings = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args, **kwargs)
+        timings.append(time.perf_counter() - started)
+
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=50_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = make_payloads(args.items)
+    print(f"{'backend':>8} {'payload':>8} {'encode, ms':>11} {'decode, ms':>11}")
+
+    for backend in available_json_backends():
+        for name, payload in payloads.items():
+            encoded = backend.dumps(payload, default=jsonable_encoder)
+            encode = best_of(args.repeat, backend.dumps, payload, default=jsonable_encoder)
+            decode = best_of(args.repeat, backend.loads, encoded)
+            print(f"{backend.name:>8} {name:>8} {encode * 1000:>11.1f} {decode * 1000:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
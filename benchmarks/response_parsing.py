@@ -0,0 +1,77 @@
+"""
+Compares response body parsing strategies of PydanticModelResponseClass:
+
+* ``loads``: ujson.loads(body) -> dicts -> TypeAdapter.validate_python (previous behaviour)
+* ``validate_json``: TypeAdapter.validate_json(body) straight from bytes
+
+Usage: python benchmarks/response_parsing.py [--repeat N]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+import pydantic
+import ujson
+
+from pydantic_aiohttp.adapters import get_type_adapter
+
+
+class Item(pydantic.BaseModel):
+    id: int
+    name: str
+    price: float
+    tags: list[str]
+    active: bool
+
+
+def make_payload(size: int) -> bytes:
+    item = {"id": 0, "name": "item-name", "price": 12.5, "tags": ["a", "b", "c"], "active": True}
+    item_size = len(ujson.dumps(item)) + 1
+    return ujson.dumps([{**item, "id": i} for i in range(size // item_size)]).encode()
+
+
+def parse_loads(body: bytes):
+    return get_type_adapter(list[Item]).validate_python(ujson.loads(body.decode('utf-8')))
+
+
+def parse_validate_json(body: bytes):
+    return get_type_adapter(list[Item]).validate_json(body)
+
+
+def measure(func, body: bytes, repeat: int) -> tuple[float, float]:
+    timings = []
+
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        func(body)
+        timings.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    result = func(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return min(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'payload':>10} {'strategy':>14} {'best, ms':>10} {'peak, MB':>10}")
+
+    for size in (1 * 1024 * 1024, 50 * 1024 * 1024):
+        body = make_payload(size)
+
+        for name, func in (('loads', parse_loads), ('validate_json', parse_validate_json)):
+            best, peak = measure(func, body, args.repeat)
+            print(f"{len(body) / 1024 / 1024:>8.1f}MB {name:>14} {best * 1000:>10.1f} {peak / 1024 / 1024:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""
+Compares ways of uploading file as multipart form:
+
+* ``open``: ``data={'file': open(path, 'rb')}`` opened synchronously on event loop (previous behaviour)
+* ``streamed``: ``Client.upload_file`` streaming file with aiofiles with Content-Length known up front
+
+Server runs in separate process and discards body, so CPU time is spent by client only.
+Descriptors left open after all uploads are reported as leaked.
+
+Usage: python benchmarks/uploads.py [--size-mb N] [--repeat N]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import tempfile
+import time
+
+from aiohttp import web
+
+from pydantic_aiohttp import Client
+from pydantic_aiohttp import NoneResponseClass
+
+
+def serve(port: int):
+    async def handler(request: web.Request) -> web.Response:
+        async for _ in request.content.iter_any():
+            pass
+
+        return web.Response(status=204)
+
+    app = web.Application(client_max_size=0)
+    app.router.add_post('/upload', handler)
+    web.run_app(app, host='127.0.0.1', port=port, print=None)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def open_descriptors() -> int:
+    try:
+        return len(os.listdir('/proc/self/fd'))
+    except FileNotFoundError:
+        # Not Linux
+        return 0
+
+
+async def wait_for_server(port: int):
+    for _ in range(100):
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+        except OSError:
+            await asyncio.sleep(0.1)
+        else:
+            writer.close()
+            return
+
+    raise RuntimeError('server did not start')
+
+
+async def upload_open(client: Client, filepath: str):
+    await client.post('/upload', data={'file': open(filepath, 'rb')})
+
+
+def upload_streamed(chunk_size: int):
+    async def upload(client: Client, filepath: str):
+        await client.upload_file('/upload', filepath, chunk_size=chunk_size)
+
+    return upload
+
+
+async def measure(client: Client, upload, filepath: str, repeat: int) -> tuple[float, float, int]:
+    best_wall = best_cpu = float('inf')
+    descriptors = open_descriptors()
+
+    for _ in range(repeat):
+        started_wall, started_cpu = time.perf_counter(), time.process_time()
+        await upload(client, filepath)
+        best_wall = min(best_wall, time.perf_counter() - started_wall)
+        best_cpu = min(best_cpu, time.process_time() - started_cpu)
+
+    return best_wall, best_cpu, open_descriptors() - descriptors
+
+
+async def run(port: int, size: int, repeat: int, filepath: str):
+    await wait_for_server(port)
+    strategies = [
+        ('open', upload_open),
+        *(
+            (f'streamed {chunk_size // 1024}KB', upload_streamed(chunk_size))
+            for chunk_size in (64 * 1024, 256 * 1024, 1024 * 1024)
+        ),
+    ]
+
+    print(f"{'strategy':>16} {'MB/s':>10} {'CPU s/GB':>10} {'leaked fds':>12}")
+
+    async with Client(f'http://127.0.0.1:{port}', response_class=NoneResponseClass) as client:
+        for name, upload in strategies:
+            wall, cpu, leaked = await measure(client, upload, filepath, repeat)
+            gigabytes = size / 1024 ** 3
+            print(f"{name:>16} {size / 1024 / 1024 / wall:>10.1f} {cpu / gigabytes:>10.2f} {leaked:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size-mb', type=int, default=512)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    port = free_port()
+    size = args.size_mb * 1024 * 1024
+    server = multiprocessing.Process(target=serve, args=(port,), daemon=True)
+    server.start()
+
+    try:
+        with tempfile.NamedTemporaryFile(suffix='.bin') as file:
+            chunk = os.urandom(1024 * 1024)
+
+            for _ in range(args.size_mb):
+                file.write(chunk)
+
+            file.flush()
+            asyncio.run(run(port, size, args.repeat, file.name))
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == '__main__':
+    main()
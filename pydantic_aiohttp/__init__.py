@@ -1,11 +1,40 @@
 __version__ = '1.1.0'
 __author__ = "pylakey <pylakey@protonmail.com>"
 
+from . import adapters
+from . import cache
 from . import encoders
 from . import errors
+from . import json_backends
 from . import responses
+from . import retry
+from . import sinks
 from . import types
+from .adapters import AdapterCacheInfo
+from .adapters import TypeAdapterCache
+from .adapters import adapter_cache_info
+from .adapters import get_type_adapter
+from .balancer import BalancingStrategy
+from .balancer import Endpoint
+from .balancer import LoadBalancer
+from .batch import BatchResult
+from .batch import RequestSpec
+from .cache import CacheBackend
+from .cache import CacheEntry
+from .cache import CacheStats
+from .cache import MemoryCacheBackend
+from .cache import ResponseCache
+from .cache import SQLiteCacheBackend
+from .checkpoint import DownloadCheckpoint
+from .circuit_breaker import CircuitBreaker
+from .circuit_breaker import CircuitState
 from .client import Client
+from .concurrency import AdaptiveConcurrencyLimiter
+from .errors import ChecksumMismatchError
+from .errors import CircuitOpenError
+from .errors import ClientError
+from .errors import ConcurrencyLimitError
+from .errors import DeadlineExceededError
 from .errors import HTTPBadGateway
 from .errors import HTTPBadRequest
 from .errors import HTTPConflict
@@ -54,13 +83,40 @@ from .errors import HTTPUnsupportedMediaType
 from .errors import HTTPUpgradeRequired
 from .errors import HTTPUseProxy
 from .errors import HTTPVariantAlsoNegotiates
+from .errors import RangeNotSupportedError
+from .hedging import HedgePolicy
+from .hedging import HedgeStats
+from .json_backends import JSONBackend
+from .json_backends import MsgspecBackend
+from .json_backends import OrjsonBackend
+from .json_backends import StdlibJSONBackend
+from .json_backends import UjsonBackend
+from .json_backends import get_default_json_backend
+from .loader import BatchLoader
+from .rate_limit import RateLimit
+from .rate_limit import RateLimiter
 from .responses import JSONResponseClass
 from .responses import NoneResponseClass
 from .responses import PlainTextResponseClass
 from .responses import PydanticModelResponseClass
 from .responses import RawResponseClass
 from .responses import ResponseClass
+from .responses import ResumableStreamResponseClass
 from .responses import StreamResponseClass
+from .retry import RetryBudget
+from .retry import RetryPolicy
+from .scheduler import Priority
+from .scheduler import PriorityScheduler
+from .single_flight import SingleFlight
+from .sinks import CallbackSink
+from .sinks import FileSink
+from .sinks import HashingSink
+from .sinks import MemorySink
+from .sinks import Sink
+from .timeouts import Timeouts
+from .timeouts import deadline
+from .timeouts import get_deadline
+from .timeouts import remaining_time
 from .types import Body
 from .types import Cookies
 from .types import EmptyResponse
@@ -69,13 +125,22 @@ from .types import Headers
 from .types import HttpEncodableMapping
 from .types import Params
 from .types import StrIntMapping
+from .uploads import FilePayload
+from .uploads import UploadFile
+from .uploads import multipart_body
+from .utils import register_body_type
 
 __all__ = [
     'Client',
+    'adapters',
+    'cache',
     'encoders',
     'types',
     'responses',
+    'retry',
+    'sinks',
     'errors',
+    'json_backends',
 
     # Types
     'EmptyResponse',
@@ -86,8 +151,79 @@ __all__ = [
     'Headers',
     'Body',
     'ErrorResponseModels',
+    'register_body_type',
+
+    # Timeouts
+    'Timeouts',
+    'deadline',
+    'get_deadline',
+    'remaining_time',
+
+    # Batch
+    'RequestSpec',
+    'BatchResult',
+    'BatchLoader',
+
+    # Retries
+    'RetryPolicy',
+    'RetryBudget',
+
+    # Load balancing
+    'LoadBalancer',
+    'BalancingStrategy',
+    'Endpoint',
+
+    # Concurrency limiting
+    'AdaptiveConcurrencyLimiter',
+
+    # Scheduling
+    'Priority',
+    'PriorityScheduler',
+
+    # Circuit breaking
+    'CircuitBreaker',
+    'CircuitState',
+
+    # Hedging
+    'HedgePolicy',
+    'HedgeStats',
+
+    # Rate limiting
+    'RateLimit',
+    'RateLimiter',
+
+    # Coalescing
+    'SingleFlight',
+
+    # Caching
+    'ResponseCache',
+    'CacheEntry',
+    'CacheStats',
+    'CacheBackend',
+    'MemoryCacheBackend',
+    'SQLiteCacheBackend',
+
+    # Adapters
+    'TypeAdapterCache',
+    'AdapterCacheInfo',
+    'get_type_adapter',
+    'adapter_cache_info',
+
+    # JSON backends
+    'JSONBackend',
+    'OrjsonBackend',
+    'MsgspecBackend',
+    'UjsonBackend',
+    'StdlibJSONBackend',
+    'get_default_json_backend',
 
     # Errors
+    'ClientError',
+    'ChecksumMismatchError',
+    'CircuitOpenError',
+    'ConcurrencyLimitError',
+    'DeadlineExceededError',
+    'RangeNotSupportedError',
     'HTTPBadGateway',
     'HTTPBadRequest',
     'HTTPConflict',
@@ -145,4 +281,18 @@ __all__ = [
     'JSONResponseClass',
     'PydanticModelResponseClass',
     'StreamResponseClass',
+    'ResumableStreamResponseClass',
+    'DownloadCheckpoint',
+
+    # Uploads
+    'UploadFile',
+    'FilePayload',
+    'multipart_body',
+
+    # Download sinks
+    'Sink',
+    'FileSink',
+    'MemorySink',
+    'HashingSink',
+    'CallbackSink',
 ]
@@ -0,0 +1,89 @@
+import threading
+from collections import OrderedDict
+from typing import Any
+from typing import NamedTuple
+
+import pydantic
+
+DEFAULT_ADAPTER_CACHE_SIZE = 1024
+
+
+class AdapterCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class TypeAdapterCache:
+    """
+    Bounded LRU cache of ``pydantic.TypeAdapter`` instances keyed by type.
+
+    Building an adapter compiles a validator schema, which is far more expensive than
+    validating a typical response payload, so every response model (including generics
+    like ``list[Model]`` or ``dict[str, Model]``) is compiled only once.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_ADAPTER_CACHE_SIZE):
+        if maxsize <= 0:
+            raise ValueError('maxsize must be positive')
+
+        self._maxsize = maxsize
+        self._adapters: OrderedDict[Any, pydantic.TypeAdapter] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, type_: Any) -> pydantic.TypeAdapter:
+        try:
+            hash(type_)
+        except TypeError:
+            # Unhashable annotations (e.g. Annotated with unhashable metadata) are never cached
+            with self._lock:
+                self._misses += 1
+
+            return pydantic.TypeAdapter(type_)
+
+        with self._lock:
+            adapter = self._adapters.get(type_)
+
+            if adapter is not None:
+                self._adapters.move_to_end(type_)
+                self._hits += 1
+                return adapter
+
+            self._misses += 1
+
+        # Schema is built outside the lock, so slow builds do not block other lookups.
+        # Concurrent builds of the same type are harmless: the first stored adapter wins.
+        adapter = pydantic.TypeAdapter(type_)
+
+        with self._lock:
+            adapter = self._adapters.setdefault(type_, adapter)
+            self._adapters.move_to_end(type_)
+
+            while len(self._adapters) > self._maxsize:
+                self._adapters.popitem(last=False)
+
+        return adapter
+
+    def cache_info(self) -> AdapterCacheInfo:
+        with self._lock:
+            return AdapterCacheInfo(self._hits, self._misses, self._maxsize, len(self._adapters))
+
+    def cache_clear(self):
+        with self._lock:
+            self._adapters.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+adapter_cache = TypeAdapterCache()
+
+
+def get_type_adapter(type_: Any) -> pydantic.TypeAdapter:
+    return adapter_cache.get(type_)
+
+
+def adapter_cache_info() -> AdapterCacheInfo:
+    return adapter_cache.cache_info()
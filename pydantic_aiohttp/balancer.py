@@ -0,0 +1,147 @@
+import asyncio
+import contextlib
+import enum
+import random
+import time
+from typing import Iterator
+from typing import Optional
+from typing import Sequence
+from typing import Union
+
+import aiohttp
+from yarl import URL
+
+from .errors import HTTPServerError
+from .errors import matches_error
+
+# Errors showing that endpoint itself is unhealthy, client errors such as 404 do not count
+ENDPOINT_FAILURES = (HTTPServerError, aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+
+class BalancingStrategy(str, enum.Enum):
+    ROUND_ROBIN = 'round_robin'
+    LEAST_OUTSTANDING = 'least_outstanding'
+    # Power of two random choices comparing latency EWMA weighted by outstanding requests
+    P2C_EWMA = 'p2c_ewma'
+
+
+class Endpoint:
+    __slots__ = ('url', 'outstanding', 'latency_ewma', 'consecutive_failures', 'ejected_until')
+
+    def __init__(self, url: Union[str, URL]):
+        self.url = URL(url)
+        self.outstanding = 0
+        self.latency_ewma: Optional[float] = None
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+    def is_healthy(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({str(self.url)!r})'
+
+
+class LoadBalancer:
+    """
+    Spreads requests of ``Client`` across several base URLs sharing one connection pool.
+
+    Endpoint returning ``failure_threshold`` server errors or connection errors in a row is ejected
+    for ``cooldown`` seconds. If every endpoint is ejected, requests are spread across all of them anyway.
+    """
+
+    def __init__(
+            self,
+            base_urls: Sequence[Union[str, URL]],
+            *,
+            strategy: Union[BalancingStrategy, str] = BalancingStrategy.ROUND_ROBIN,
+            failure_threshold: int = 5,
+            cooldown: float = 30.0,
+            ewma_alpha: float = 0.3,
+    ):
+        if not base_urls:
+            raise ValueError('at least one base URL is required')
+        if failure_threshold < 1:
+            raise ValueError('failure_threshold must be at least 1')
+
+        self.endpoints = [Endpoint(url) for url in base_urls]
+        self.strategy = BalancingStrategy(strategy)
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.ewma_alpha = ewma_alpha
+        self._next = 0
+
+    def _candidates(self) -> list[Endpoint]:
+        now = time.monotonic()
+        healthy = [endpoint for endpoint in self.endpoints if endpoint.is_healthy(now)]
+        return healthy or self.endpoints
+
+    def select(self) -> Endpoint:
+        candidates = self._candidates()
+        self._next += 1
+
+        if len(candidates) == 1:
+            return candidates[0]
+
+        if self.strategy is BalancingStrategy.ROUND_ROBIN:
+            return candidates[self._next % len(candidates)]
+
+        if self.strategy is BalancingStrategy.LEAST_OUTSTANDING:
+            # Rotating start spreads ties evenly instead of always picking first endpoint
+            start = self._next % len(candidates)
+            return min(candidates[start:] + candidates[:start], key=lambda e: e.outstanding)
+
+        first, second = random.sample(candidates, 2)
+        return first if self._load(first) <= self._load(second) else second
+
+    @staticmethod
+    def _load(endpoint: Endpoint) -> tuple[float, int]:
+        # Endpoints without observations yet are tried first, the less loaded one if both have none
+        return (endpoint.latency_ewma or 0.0) * (endpoint.outstanding + 1), endpoint.outstanding
+
+    def record(self, endpoint: Endpoint, latency: float, error: Optional[BaseException] = None):
+        if matches_error(error, ENDPOINT_FAILURES):
+            endpoint.consecutive_failures += 1
+
+            if endpoint.consecutive_failures >= self.failure_threshold:
+                endpoint.ejected_until = time.monotonic() + self.cooldown
+                endpoint.consecutive_failures = 0
+
+            return
+
+        endpoint.consecutive_failures = 0
+
+        if endpoint.latency_ewma is None:
+            endpoint.latency_ewma = latency
+        else:
+            endpoint.latency_ewma += self.ewma_alpha * (latency - endpoint.latency_ewma)
+
+    @contextlib.contextmanager
+    def reserve(self) -> Iterator[Endpoint]:
+        """
+        Selects endpoint and counts request as outstanding on it until exit. Request waiting in client queues
+        counts too, otherwise requests queued at the same time would all see the same load and pick the same endpoint
+        """
+        endpoint = self.select()
+        endpoint.outstanding += 1
+
+        try:
+            yield endpoint
+        finally:
+            endpoint.outstanding -= 1
+
+    @contextlib.contextmanager
+    def track(self, endpoint: Endpoint) -> Iterator[Endpoint]:
+        """Records outcome of request sent to ``endpoint`` reserved with ``reserve``"""
+        started_at = time.monotonic()
+
+        try:
+            yield endpoint
+        except asyncio.CancelledError:
+            # Says nothing about endpoint health, e.g. hedged request lost the race
+            raise
+        except BaseException as e:
+            self.record(endpoint, time.monotonic() - started_at, e)
+            raise
+        else:
+            self.record(endpoint, time.monotonic() - started_at)
@@ -0,0 +1,146 @@
+import asyncio
+import dataclasses
+from typing import Any
+from typing import AsyncIterable
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
+from typing import Generic
+from typing import Iterable
+from typing import Optional
+from typing import Type
+from typing import TypeVar
+from typing import Union
+
+from .responses import ResponseClass
+from .timeouts import Timeout
+from .types import Body
+from .types import Cookies
+from .types import ErrorResponseModels
+from .types import Headers
+from .types import Params
+
+ResponseType = TypeVar('ResponseType')
+
+DEFAULT_BATCH_CONCURRENCY = 100
+
+
+@dataclasses.dataclass
+class RequestSpec:
+    """Arguments of single ``Client.request`` call, ``kwargs`` are passed to it as is"""
+
+    method: str
+    path: str
+    body: Body = None
+    data: Any = None
+    headers: Headers = None
+    cookies: Cookies = None
+    params: Params = None
+    response_model: Type = None
+    timeout: Timeout = None
+    error_response_models: ErrorResponseModels = None
+    response_class: Type[ResponseClass] = None
+    kwargs: dict[str, Any] = dataclasses.field(default_factory=dict)
+
+
+@dataclasses.dataclass
+class BatchResult(Generic[ResponseType]):
+    index: int
+    spec: RequestSpec
+    result: Optional[ResponseType] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+RequestSpecs = Union[Iterable[RequestSpec], AsyncIterable[RequestSpec]]
+
+
+class _SpecsReader:
+    def __init__(self, specs: RequestSpecs):
+        if hasattr(specs, '__aiter__'):
+            self._async_iterator = specs.__aiter__()
+            self._iterator = None
+        else:
+            self._async_iterator = None
+            self._iterator = iter(specs)
+
+    async def next(self) -> Optional[RequestSpec]:
+        try:
+            if self._iterator is not None:
+                return next(self._iterator)
+
+            return await self._async_iterator.__anext__()
+        except (StopIteration, StopAsyncIteration):
+            return None
+
+
+async def run_batch(
+        execute: Callable[[RequestSpec], Awaitable[Any]],
+        specs: RequestSpecs,
+        *,
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        ordered: bool = True,
+) -> AsyncIterator[BatchResult]:
+    """
+    Runs ``execute`` for every spec with at most ``concurrency`` of them in flight.
+
+    Specs are consumed lazily, so memory stays bounded regardless of input size. In ordered mode results
+    which completed ahead of a slow one are buffered, and no more than ``2 * concurrency`` specs are taken
+    from input before the slow one is yielded. Errors are reported per item in ``BatchResult.error``.
+    """
+    if concurrency < 1:
+        raise ValueError('concurrency must be positive')
+
+    async def _run(index: int, spec: RequestSpec) -> BatchResult:
+        try:
+            return BatchResult(index=index, spec=spec, result=await execute(spec))
+        except Exception as e:
+            return BatchResult(index=index, spec=spec, error=e)
+
+    reader = _SpecsReader(specs)
+    window = 2 * concurrency
+    running: set[asyncio.Task] = set()
+    buffered: dict[int, BatchResult] = {}
+    started = 0
+    next_index = 0
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(running) < concurrency and (not ordered or started - next_index < window):
+                spec = await reader.next()
+
+                if spec is None:
+                    exhausted = True
+                    break
+
+                running.add(asyncio.create_task(_run(started, spec)))
+                started += 1
+
+            if not running:
+                break
+
+            done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            results = sorted((task.result() for task in done), key=lambda r: r.index)
+
+            if not ordered:
+                for result in results:
+                    yield result
+
+                continue
+
+            for result in results:
+                buffered[result.index] = result
+
+            while next_index in buffered:
+                yield buffered.pop(next_index)
+                next_index += 1
+    finally:
+        for task in running:
+            task.cancel()
+
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
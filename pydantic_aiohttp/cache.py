@@ -0,0 +1,491 @@
+import abc
+import asyncio
+import dataclasses
+import email.utils
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from typing import Mapping
+from typing import Optional
+from typing import Union
+
+from aiohttp.typedefs import PathLike
+from multidict import CIMultiDict
+
+DEFAULT_CACHE_MAX_ENTRIES = 1024
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 64MB
+
+
+@dataclasses.dataclass
+class CacheEntry:
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # Freshness headers of stored response, reused when 304 response does not update them
+    cache_control: Optional[str] = None
+    expires: Optional[str] = None
+    # Unix timestamp after which entry must be revalidated
+    expires_at: float = 0.0
+    # Unix timestamp until which expired entry may still be served while it is refreshed in background
+    stale_until: float = 0.0
+    stored_at: float = dataclasses.field(default_factory=time.time)
+    # Already parsed body, kept only by in-memory backend.
+    # NOTE: the same object is returned to every caller, it must not be mutated
+    value: Any = dataclasses.field(default=None, compare=False)
+    value_key: Any = dataclasses.field(default=None, compare=False)
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+    def is_fresh(self, now: float = None) -> bool:
+        return (now or time.time()) < self.expires_at
+
+    def is_servable_stale(self, now: float = None) -> bool:
+        return (now or time.time()) < self.stale_until
+
+    @property
+    def can_revalidate(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+
+@dataclasses.dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stale_hits: int = 0
+    revalidated: int = 0
+    refreshes: int = 0
+    refresh_failures: int = 0
+
+
+class CacheBackend(abc.ABC):
+    @abc.abstractmethod
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        pass
+
+    @abc.abstractmethod
+    async def set(self, key: str, entry: CacheEntry):
+        pass
+
+    @abc.abstractmethod
+    async def delete(self, key: str):
+        pass
+
+    @abc.abstractmethod
+    async def clear(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """LRU cache bounded both by number of entries and by total size of bodies"""
+
+    def __init__(self, *, max_entries: int = DEFAULT_CACHE_MAX_ENTRIES, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._bytes
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            self._entries.move_to_end(key)
+
+        return entry
+
+    async def set(self, key: str, entry: CacheEntry):
+        if entry.size > self.max_bytes:
+            await self.delete(key)
+            return
+
+        previous = self._entries.pop(key, None)
+
+        if previous is not None:
+            self._bytes -= previous.size
+
+        self._entries[key] = entry
+        self._bytes += entry.size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+
+    async def delete(self, key: str):
+        entry = self._entries.pop(key, None)
+
+        if entry is not None:
+            self._bytes -= entry.size
+
+    async def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    On-disk LRU cache stored in sqlite database. Only raw bodies are stored, so cached responses are parsed
+    again on every hit. Database is accessed from worker threads and never blocks the event loop.
+    """
+
+    def __init__(
+            self,
+            path: Union[str, PathLike],
+            *,
+            max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+            max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'key TEXT PRIMARY KEY, '
+            'body BLOB NOT NULL, '
+            'etag TEXT, '
+            'last_modified TEXT, '
+            'cache_control TEXT, '
+            'expires TEXT, '
+            'expires_at REAL NOT NULL, '
+            'stale_until REAL NOT NULL, '
+            'stored_at REAL NOT NULL, '
+            'size INTEGER NOT NULL, '
+            'accessed_at REAL NOT NULL'
+            ')'
+        )
+        self._connection.execute('CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)')
+        columns = {row[1] for row in self._connection.execute('PRAGMA table_info(entries)')}
+
+        for column in ('cache_control', 'expires'):
+            if column not in columns:
+                # Database created by previous version
+                self._connection.execute(f'ALTER TABLE entries ADD COLUMN {column} TEXT')
+
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT body, etag, last_modified, cache_control, expires, expires_at, stale_until, stored_at '
+                'FROM entries WHERE key = ?',
+                (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            self._connection.execute('UPDATE entries SET accessed_at = ? WHERE key = ?', (time.time(), key))
+
+        body, etag, last_modified, cache_control, expires, expires_at, stale_until, stored_at = row
+        return CacheEntry(
+            body=body,
+            etag=etag,
+            last_modified=last_modified,
+            cache_control=cache_control,
+            expires=expires,
+            expires_at=expires_at,
+            stale_until=stale_until,
+            stored_at=stored_at
+        )
+
+    def _set(self, key: str, entry: CacheEntry):
+        with self._lock:
+            if entry.size > self.max_bytes:
+                self._connection.execute('DELETE FROM entries WHERE key = ?', (key,))
+                return
+
+            self._connection.execute(
+                'INSERT OR REPLACE INTO entries '
+                '(key, body, etag, last_modified, cache_control, expires, expires_at, stale_until, stored_at, size, '
+                'accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (
+                    key,
+                    entry.body,
+                    entry.etag,
+                    entry.last_modified,
+                    entry.cache_control,
+                    entry.expires,
+                    entry.expires_at,
+                    entry.stale_until,
+                    entry.stored_at,
+                    entry.size,
+                    time.time()
+                )
+            )
+            self._evict()
+
+    def _evict(self):
+        count, total = self._connection.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        evicted = []
+
+        for key, size in self._connection.execute('SELECT key, size FROM entries ORDER BY accessed_at'):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+
+            evicted.append((key,))
+            count -= 1
+            total -= size
+
+        self._connection.executemany('DELETE FROM entries WHERE key = ?', evicted)
+
+    def _delete(self, key: str):
+        with self._lock:
+            self._connection.execute('DELETE FROM entries WHERE key = ?', (key,))
+
+    def _clear(self):
+        with self._lock:
+            self._connection.execute('DELETE FROM entries')
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, entry: CacheEntry):
+        await asyncio.to_thread(self._set, key, entry)
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self._delete, key)
+
+    async def clear(self):
+        await asyncio.to_thread(self._clear)
+
+    async def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def _parse_cache_control(value: str) -> dict[str, Optional[str]]:
+    directives = {}
+
+    for directive in value.split(','):
+        name, _, argument = directive.strip().partition('=')
+
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+
+    return directives
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class ResponseCache:
+    """
+    Private HTTP cache of successfully parsed responses.
+
+    Freshness is taken from ``Cache-Control: max-age`` (minus ``Age``) or ``Expires``, ``no-store`` responses
+    are not stored and ``no-cache`` ones are always revalidated. Stale entries having ``ETag`` or
+    ``Last-Modified`` are revalidated with conditional request, and on ``304 Not Modified`` cached value is
+    returned without parsing body again.
+
+    With ``stale_while_revalidate`` expired entry is served immediately during that many seconds after expiration
+    (or as long as ``stale-while-revalidate`` directive of response allows) while single background request
+    refreshes it. ``max_staleness`` caps that window regardless of response directives.
+    """
+
+    def __init__(
+            self,
+            backend: CacheBackend = None,
+            *,
+            methods: frozenset[str] = frozenset({'GET'}),
+            stale_while_revalidate: float = 0.0,
+            max_staleness: Optional[float] = None,
+    ):
+        self.backend = backend or MemoryCacheBackend()
+        self.methods = methods
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_staleness = max_staleness
+        self.stats = CacheStats()
+        # Consecutive background refresh failures by cache key
+        self.refresh_failures: dict[str, int] = {}
+
+    def record_refresh(self, key: str, error: Optional[Exception] = None):
+        self.stats.refreshes += 1
+
+        if error is None:
+            self.refresh_failures.pop(key, None)
+            return
+
+        self.stats.refresh_failures += 1
+        self.refresh_failures[key] = self.refresh_failures.get(key, 0) + 1
+
+    @staticmethod
+    def build_key(
+            method: str,
+            url: str,
+            params: Optional[Mapping[str, Any]],
+            headers: Optional[Mapping[str, Any]],
+            cookies: Optional[Mapping[str, Any]] = None,
+    ) -> str:
+        key = hashlib.sha256()
+
+        for part in (method.upper(), url):
+            key.update(part.encode())
+            key.update(b'\0')
+
+        # Every header and cookie is part of the key, so entries never vary on request headers
+        for mapping in (params, headers, cookies):
+            for name, value in sorted((mapping or {}).items()):
+                key.update(f"{name}={value}".encode())
+                key.update(b'\0')
+
+            key.update(b'\1')
+
+        return key.hexdigest()
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        return await self.backend.get(key)
+
+    async def set(self, key: str, entry: CacheEntry):
+        await self.backend.set(key, entry)
+
+    async def delete(self, key: str):
+        await self.backend.delete(key)
+
+    @staticmethod
+    def conditional_headers(entry: CacheEntry) -> dict[str, str]:
+        headers = {}
+
+        if entry.etag is not None:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified is not None:
+            headers['If-Modified-Since'] = entry.last_modified
+
+        return headers
+
+    def _stale_window(self, cache_control: dict[str, Optional[str]]) -> float:
+        if 'no-cache' in cache_control or 'must-revalidate' in cache_control:
+            return 0.0
+
+        window = self.stale_while_revalidate
+
+        try:
+            window = float(cache_control['stale-while-revalidate'])
+        except (KeyError, TypeError, ValueError):
+            pass
+
+        if self.max_staleness is not None:
+            window = min(window, self.max_staleness)
+
+        return max(window, 0.0)
+
+    @staticmethod
+    def _expires_at(
+            cache_control: dict[str, Optional[str]],
+            headers: Mapping[str, str],
+            now: float,
+    ) -> Optional[float]:
+        """Returns expiration timestamp, or None if response must not be stored"""
+        if 'no-store' in cache_control:
+            return None
+
+        if 'no-cache' in cache_control:
+            return now
+
+        max_age = cache_control.get('max-age')
+
+        if max_age is not None:
+            try:
+                age = float(headers.get('Age', 0))
+                return now + max(float(max_age) - age, 0.0)
+            except ValueError:
+                return now
+
+        expires = headers.get('Expires')
+
+        if expires is not None:
+            expires_at = _parse_http_date(expires)
+
+            if expires_at is None:
+                # Invalid Expires means already expired
+                return now
+
+            date = _parse_http_date(headers.get('Date'))
+            # Compensate clock difference with server
+            return now + (expires_at - (date if date is not None else now))
+
+        return now
+
+    def entry_from_response(self, headers: Mapping[str, str], body: bytes) -> Optional[CacheEntry]:
+        now = time.time()
+        cache_control = _parse_cache_control(headers.get('Cache-Control', ''))
+
+        if headers.get('Vary', '').strip() == '*':
+            # Response varies on something besides request headers
+            return None
+
+        expires_at = self._expires_at(cache_control, headers, now)
+
+        if expires_at is None:
+            return None
+
+        entry = CacheEntry(
+            body=body,
+            etag=headers.get('ETag'),
+            last_modified=headers.get('Last-Modified'),
+            cache_control=headers.get('Cache-Control'),
+            expires=headers.get('Expires'),
+            expires_at=expires_at,
+            stale_until=expires_at + self._stale_window(cache_control),
+            stored_at=now
+        )
+
+        if not entry.is_fresh(now) and not entry.can_revalidate:
+            # Could be neither served nor revalidated
+            return None
+
+        return entry
+
+    def revalidated(self, entry: CacheEntry, headers: Mapping[str, str]) -> Optional[CacheEntry]:
+        """Updates entry with headers of 304 response, returns None if entry could not be reused"""
+        now = time.time()
+
+        if headers.get('Vary', '').strip() == '*':
+            # Response varies on something besides request headers
+            return None
+
+        # Stored freshness is kept unless 304 response updates it, see RFC 9111 section 4.3.4
+        headers = CIMultiDict(headers)
+
+        for name, value in (('Cache-Control', entry.cache_control), ('Expires', entry.expires)):
+            if value is not None:
+                headers.setdefault(name, value)
+
+        cache_control = _parse_cache_control(headers.get('Cache-Control', ''))
+        expires_at = self._expires_at(cache_control, headers, now)
+
+        entry.cache_control = headers.get('Cache-Control')
+        entry.expires = headers.get('Expires')
+        entry.expires_at = expires_at if expires_at is not None else now
+        entry.stale_until = entry.expires_at + self._stale_window(cache_control)
+        entry.stored_at = now
+        entry.etag = headers.get('ETag', entry.etag)
+        entry.last_modified = headers.get('Last-Modified', entry.last_modified)
+        return entry
+
+    async def close(self):
+        await self.backend.close()
@@ -0,0 +1,54 @@
+import contextlib
+import dataclasses
+import json
+import os
+from typing import Mapping
+from typing import Optional
+
+import aiofiles
+import aiofiles.os
+from aiohttp.typedefs import PathLike
+
+
+def content_validator(headers: Mapping[str, str]) -> Optional[str]:
+    """Returns strong ETag or Last-Modified of response usable in If-Range"""
+    etag = headers.get('ETag')
+
+    if etag is not None and not etag.startswith('W/'):
+        # Weak validators are not allowed in If-Range
+        return etag
+
+    return headers.get('Last-Modified')
+
+
+@dataclasses.dataclass
+class DownloadCheckpoint:
+    """Sidecar of partially downloaded file, content is resumed only if ``key`` and ``validator`` still match"""
+
+    # Identifies request, i.e. method, URL and params
+    key: str
+    # Strong ETag or Last-Modified of content, sent as If-Range
+    validator: Optional[str] = None
+    size: Optional[int] = None
+
+    @staticmethod
+    def path_for(filepath: PathLike) -> str:
+        return f'{os.fspath(filepath)}.checkpoint'
+
+    @classmethod
+    async def load(cls, path: PathLike) -> Optional['DownloadCheckpoint']:
+        try:
+            async with aiofiles.open(path, 'r') as f:
+                return cls(**json.loads(await f.read()))
+        except (OSError, ValueError, TypeError):
+            # Missing or corrupted checkpoint means starting from scratch
+            return None
+
+    async def save(self, path: PathLike):
+        async with aiofiles.open(path, 'w') as f:
+            await f.write(json.dumps(dataclasses.asdict(self)))
+
+    @staticmethod
+    async def remove(path: PathLike):
+        with contextlib.suppress(FileNotFoundError):
+            await aiofiles.os.remove(path)
@@ -0,0 +1,203 @@
+import asyncio
+import contextlib
+import enum
+import re
+import time
+from collections import deque
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Type
+from typing import Union
+
+import aiohttp
+from yarl import URL
+
+from .errors import CircuitOpenError
+from .errors import HTTPServerError
+from .errors import matches_error
+
+DEFAULT_FAILURE_TYPES: tuple[Type[BaseException], ...] = (
+    HTTPServerError,
+    aiohttp.ClientConnectionError,
+    asyncio.TimeoutError,
+)
+
+
+class CircuitState(str, enum.Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+StateChangeHook = Callable[[tuple, CircuitState, CircuitState], None]
+
+
+class Circuit:
+    """State of single circuit, created by ``CircuitBreaker`` for every host or route"""
+
+    def __init__(self, key: tuple, breaker: 'CircuitBreaker'):
+        self.key = key
+        self.state = CircuitState.CLOSED
+        self._breaker = breaker
+        # (failed, slow) outcomes of last calls
+        self._outcomes: deque[tuple[bool, bool]] = deque(maxlen=breaker.window)
+        self._trial_outcomes: list[tuple[bool, bool]] = []
+        self._trial_calls = 0
+        self._opened_at = 0.0
+
+    def _transition(self, state: CircuitState):
+        previous, self.state = self.state, state
+        self._outcomes.clear()
+        self._trial_outcomes.clear()
+        self._trial_calls = 0
+
+        if state is CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+
+        self._breaker.notify(self.key, previous, state)
+
+    def _retry_after(self) -> float:
+        return max(self._opened_at + self._breaker.open_duration - time.monotonic(), 0.0)
+
+    def _refresh_state(self):
+        if self.state is CircuitState.OPEN and self._retry_after() == 0:
+            self._transition(CircuitState.HALF_OPEN)
+
+    def raise_if_open(self):
+        self._refresh_state()
+
+        if self.state is CircuitState.OPEN:
+            raise CircuitOpenError(self.key, retry_after=self._retry_after())
+
+    def _acquire(self):
+        self.raise_if_open()
+
+        if self.state is CircuitState.HALF_OPEN:
+            if self._trial_calls >= self._breaker.half_open_calls:
+                raise CircuitOpenError(self.key, retry_after=0.0)
+
+            self._trial_calls += 1
+
+    def _exceeds_thresholds(self, outcomes: Iterable[tuple[bool, bool]]) -> bool:
+        outcomes = list(outcomes)
+        failed = sum(1 for failure, _ in outcomes if failure)
+        slow = sum(1 for _, is_slow in outcomes if is_slow)
+
+        return (
+                failed / len(outcomes) >= self._breaker.failure_rate_threshold
+                or slow / len(outcomes) >= self._breaker.slow_call_rate_threshold
+        )
+
+    def _record(self, failed: bool, slow: bool):
+        if self.state is CircuitState.HALF_OPEN:
+            self._trial_outcomes.append((failed, slow))
+
+            if len(self._trial_outcomes) >= self._breaker.half_open_calls:
+                if self._exceeds_thresholds(self._trial_outcomes):
+                    self._transition(CircuitState.OPEN)
+                else:
+                    self._transition(CircuitState.CLOSED)
+
+            return
+
+        if self.state is CircuitState.OPEN:
+            # Late result of request started before circuit was opened
+            return
+
+        self._outcomes.append((failed, slow))
+
+        if len(self._outcomes) >= self._breaker.min_calls and self._exceeds_thresholds(self._outcomes):
+            self._transition(CircuitState.OPEN)
+
+    @contextlib.contextmanager
+    def track(self) -> Iterator['Circuit']:
+        """Raises ``CircuitOpenError`` if request is not permitted, otherwise records its outcome"""
+        self._acquire()
+        started_at = time.monotonic()
+
+        try:
+            yield self
+        except asyncio.CancelledError:
+            if self.state is CircuitState.HALF_OPEN:
+                self._trial_calls = max(self._trial_calls - 1, 0)
+
+            raise
+        except BaseException as e:
+            self._record(
+                matches_error(e, self._breaker.failure_types),
+                time.monotonic() - started_at >= self._breaker.slow_call_duration
+            )
+            raise
+        else:
+            self._record(False, time.monotonic() - started_at >= self._breaker.slow_call_duration)
+
+
+class CircuitBreaker:
+    """
+    Fails requests fast with ``CircuitOpenError`` while upstream is down, without touching network.
+
+    Every host has its own circuit, requests whose URL path matches one of ``routes`` regular expressions
+    get circuit per route. Circuit opens when at least ``min_calls`` of last ``window`` calls were made and
+    share of failed calls reaches ``failure_rate_threshold`` or share of calls slower than ``slow_call_duration``
+    reaches ``slow_call_rate_threshold``. After ``open_duration`` seconds circuit is half-open and lets
+    ``half_open_calls`` trial requests through, which close it again or open it for another period.
+    """
+
+    def __init__(
+            self,
+            *,
+            failure_rate_threshold: float = 0.5,
+            slow_call_rate_threshold: float = 1.0,
+            slow_call_duration: float = 60.0,
+            window: int = 100,
+            min_calls: int = 10,
+            open_duration: float = 30.0,
+            half_open_calls: int = 5,
+            failure_types: tuple[Type[BaseException], ...] = DEFAULT_FAILURE_TYPES,
+            routes: Iterable[Union[str, re.Pattern]] = (),
+            on_state_change: Optional[StateChangeHook] = None,
+    ):
+        if min_calls < 1 or half_open_calls < 1:
+            raise ValueError('min_calls and half_open_calls must be at least 1')
+        if window < min_calls:
+            raise ValueError('window must not be smaller than min_calls')
+
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.window = window
+        self.min_calls = min_calls
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+        self.failure_types = failure_types
+        self._routes = [re.compile(pattern) for pattern in routes]
+        self._hooks: list[StateChangeHook] = [on_state_change] if on_state_change is not None else []
+        self._circuits: dict[tuple, Circuit] = {}
+
+    def add_state_change_hook(self, hook: StateChangeHook):
+        """Registers ``hook(key, previous_state, new_state)`` called on every state change of any circuit"""
+        self._hooks.append(hook)
+
+    def notify(self, key: tuple, previous: CircuitState, state: CircuitState):
+        for hook in self._hooks:
+            hook(key, previous, state)
+
+    def circuit_for(self, url: URL) -> Circuit:
+        for pattern in self._routes:
+            if pattern.search(url.path):
+                key = ('route', url.host, pattern.pattern)
+                break
+        else:
+            key = ('host', url.host)
+
+        circuit = self._circuits.get(key)
+
+        if circuit is None:
+            circuit = self._circuits[key] = Circuit(key, self)
+
+        return circuit
+
+    def states(self) -> dict[tuple, CircuitState]:
+        return {key: circuit.state for key, circuit in self._circuits.items()}
@@ -1,32 +1,88 @@
+import asyncio
+import contextlib
+import dataclasses
+import functools
+import http
 import logging
+import math
+import time
+from types import MappingProxyType
 from typing import Any
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
 from typing import Optional
 from typing import Type
 from typing import TypeVar
 from typing import Union
 
+import aiofiles
+import aiofiles.os
 import aiohttp
 import pydantic
-import ujson
 from aiohttp.typedefs import PathLike
-from ujson import JSONDecodeError
+from yarl import URL
 
+from .adapters import get_type_adapter
+from .balancer import LoadBalancer
+from .batch import BatchResult
+from .batch import DEFAULT_BATCH_CONCURRENCY
+from .batch import RequestSpec
+from .batch import RequestSpecs
+from .batch import run_batch
+from .cache import CacheEntry
+from .cache import ResponseCache
+from .checkpoint import DownloadCheckpoint
+from .checkpoint import content_validator
+from .circuit_breaker import CircuitBreaker
+from .concurrency import AdaptiveConcurrencyLimiter
 from .encoders import url_compatible_encoder
+from .errors import DeadlineExceededError
 from .errors import HTTPError
+from .errors import RangeNotSupportedError
 from .errors import ResponseParseError
 from .errors import errors_classes
+from .hedging import HedgePolicy
+from .json_backends import JSONBackend
+from .json_backends import get_default_json_backend
+from .rate_limit import RateLimiter
 from .responses import PydanticModelResponseClass
+from .responses import RawResponseClass
 from .responses import ResponseClass
+from .responses import ResumableStreamResponseClass
 from .responses import StreamResponseClass
+from .retry import IDEMPOTENT_METHODS
+from .retry import RetryBudget
+from .retry import RetryPolicy
+from .scheduler import Priority
+from .scheduler import PriorityScheduler
+from .single_flight import COALESCED_METHODS
+from .single_flight import SingleFlight
+from .sinks import Sink
+from .timeouts import Timeout
+from .timeouts import Timeouts
+from .timeouts import context_with_deadline
+from .timeouts import deadline_timeouts
+from .timeouts import get_deadline
+from .timeouts import remaining_time
+from .timeouts import resolve_timeouts
 from .types import Body
 from .types import Cookies
 from .types import ErrorResponseModels
 from .types import Headers
 from .types import Params
+from .uploads import FilePayload
+from .uploads import UploadFiles
+from .uploads import multipart_body
 from .utils import DEFAULT_DOWNLOAD_CHUNK_SIZE
+from .utils import DEFAULT_DOWNLOAD_PART_SIZE
+from .utils import DEFAULT_UPLOAD_CHUNK_SIZE
+from .utils import DEFAULT_WRITE_BATCH_SIZE
+from .utils import encode_body
+from .utils import is_replayable
 from .utils import json_serialize
 from .utils import model_to_dict
-from .utils import read_file_by_chunk
+from .utils import url_encode_mapping
 
 ResponseType = TypeVar('ResponseType')
 
@@ -42,7 +98,29 @@ class Client:
             error_response_models: ErrorResponseModels = None,
             bearer_token: Union[str, pydantic.SecretStr] = None,
             response_class: Type[ResponseClass] = PydanticModelResponseClass,
+            json_backend: JSONBackend = None,
+            connector: aiohttp.BaseConnector = None,
+            connection_limit: int = 100,
+            connection_limit_per_host: int = 0,
+            keepalive_timeout: float = 15,
+            dns_cache_ttl: Optional[int] = 10,
+            happy_eyeballs_delay: Optional[float] = 0.25,
+            force_close: bool = False,
+            retry_policy: RetryPolicy = None,
+            retry_budget: RetryBudget = None,
+            rate_limiter: RateLimiter = None,
+            cache: ResponseCache = None,
+            coalesce_requests: bool = False,
+            hedge_policy: HedgePolicy = None,
+            load_balancer: LoadBalancer = None,
+            circuit_breaker: CircuitBreaker = None,
+            concurrency_limiter: AdaptiveConcurrencyLimiter = None,
+            scheduler: PriorityScheduler = None,
+            timeouts: Timeouts = None,
     ):
+        if base_url is not None and load_balancer is not None:
+            raise ValueError('base_url and load_balancer parameters can not be used at the same time')
+
         self.logger = logging.getLogger("pydantic_aiohttp.Client")
         headers = model_to_dict(headers) or {}
         cookies = model_to_dict(cookies) or {}
@@ -56,14 +134,88 @@ class Client:
 
         self._error_response_models = error_response_models or {}
         self._response_class = response_class
-        self._params = params
+        self._json_backend = json_backend or get_default_json_backend()
+        self._retry_policy = retry_policy
+        self._hedge_policy = hedge_policy
+        self._retry_budget = retry_budget or RetryBudget()
+        self._rate_limiter = rate_limiter
+        self._load_balancer = load_balancer
+        self._circuit_breaker = circuit_breaker
+        self._concurrency_limiter = concurrency_limiter
+        self._scheduler = scheduler
+        self._timeouts = timeouts or Timeouts()
+        self._cache = cache
+        self._refresh_tasks: dict[str, asyncio.Task] = {}
+        self._keep_fresh_tasks: set[asyncio.Task] = set()
+        self._coalesce_requests = coalesce_requests
+        self._single_flight = SingleFlight()
+        self._base_url = URL(base_url) if base_url is not None else None
+        # Client-wide values are encoded once, per-request overrides are merged into a copy
+        self._params = MappingProxyType(url_compatible_encoder(params))
+        self._headers = MappingProxyType(url_compatible_encoder(headers))
+        self._cookies = MappingProxyType(url_compatible_encoder(cookies))
+        # Shared connector is owned by the caller and is not closed together with this client
+        connector_owner = connector is None
+
+        if connector is None:
+            connector = self.create_connector(
+                connection_limit=connection_limit,
+                connection_limit_per_host=connection_limit_per_host,
+                keepalive_timeout=keepalive_timeout,
+                dns_cache_ttl=dns_cache_ttl,
+                happy_eyeballs_delay=happy_eyeballs_delay,
+                force_close=force_close,
+            )
+
+        # URLs are joined with base_url by _build_url, so session always gets absolute ones.
+        # Sessions with base_url reject absolute URLs in aiohttp < 3.12
         self._session = aiohttp.ClientSession(
-            base_url,
-            headers=headers,
-            cookies=cookies,
-            json_serialize=json_serialize
+            connector=connector,
+            connector_owner=connector_owner,
+            headers=self._headers,
+            cookies=self._cookies,
+            json_serialize=functools.partial(json_serialize, json_backend=self._json_backend)
         )
 
+    @staticmethod
+    def create_connector(
+            *,
+            connection_limit: int = 100,
+            connection_limit_per_host: int = 0,
+            keepalive_timeout: float = 15,
+            dns_cache_ttl: Optional[int] = 10,
+            happy_eyeballs_delay: Optional[float] = 0.25,
+            force_close: bool = False,
+    ) -> aiohttp.TCPConnector:
+        """
+        Creates connection pool which may be shared between several clients via ``connector`` parameter.
+
+        ``connection_limit`` and ``connection_limit_per_host`` of 0 mean no limit, ``dns_cache_ttl`` of None caches
+        DNS lookups forever and ``happy_eyeballs_delay`` of None disables Happy Eyeballs.
+        """
+        connector_kwargs = {}
+
+        if not force_close:
+            # aiohttp does not allow keepalive_timeout together with force_close
+            connector_kwargs['keepalive_timeout'] = keepalive_timeout
+
+        return aiohttp.TCPConnector(
+            limit=connection_limit,
+            limit_per_host=connection_limit_per_host,
+            ttl_dns_cache=dns_cache_ttl,
+            happy_eyeballs_delay=happy_eyeballs_delay,
+            force_close=force_close,
+            **connector_kwargs
+        )
+
+    def _build_url(self, path: str) -> URL:
+        url = URL(path)
+
+        if self._base_url is None or url.absolute:
+            return url
+
+        return self._base_url.join(url)
+
     async def _parse_response_error(
             self,
             response: aiohttp.ClientResponse,
@@ -74,16 +226,22 @@ class Client:
         error_response_model = error_response_models.get(response.status)
 
         try:
-            response_json = await response.json(loads=ujson.loads, content_type=None)
-        except JSONDecodeError:
+            response_json = await response.json(loads=self._json_backend.loads, content_type=None)
+        except self._json_backend.decode_errors:
             response_text = await response.text()
-            raise ResponseParseError(raw_response=response_text)
+            raise ResponseParseError(
+                raw_response=response_text,
+                status_code=response.status,
+                headers=response.headers
+            )
 
         if bool(error_response_model):
-            adapter = pydantic.TypeAdapter(error_response_model)
-            raise error_class(adapter.validate_python(response_json))
+            raise error_class(
+                get_type_adapter(error_response_model).validate_python(response_json),
+                headers=response.headers
+            )
 
-        raise error_class(response_json)
+        raise error_class(response_json, headers=response.headers)
 
     async def download_file(
             self,
@@ -93,10 +251,82 @@ class Client:
             headers: Headers = None,
             cookies: Cookies = None,
             params: Params = None,
-            timeout: int = 300,  # Default in aiohttp
+            timeout: Timeout = None,
             error_response_models: ErrorResponseModels = None,
             chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
-    ) -> aiohttp.typedefs.PathLike:
+            parallel: int = 1,
+            part_size: int = DEFAULT_DOWNLOAD_PART_SIZE,
+            resume: bool = False,
+            retry_policy: RetryPolicy = None,
+            write_batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+            sink: Sink = None,
+    ) -> Any:
+        """
+        Downloads file to ``filepath`` or streams it into ``sink`` and returns its result, see ``sinks``.
+        With ``parallel`` greater than 1 and server supporting byte ranges, file is split into at most ``parallel`` ranges of at least ``part_size`` bytes downloaded concurrently.
+
+        With ``resume=True`` partially downloaded file is kept together with ``<filepath>.checkpoint`` sidecar,
+        and every next attempt, including retries of ``retry_policy``, continues from where previous one stopped
+        as long as content on server has not changed.
+
+        Received chunks are written to disk in batches of ``write_batch_size`` bytes by separate thread
+        """
+        if sink is not None:
+            if resume:
+                raise ValueError('resume can not be used with sink')
+
+            # Ranges could only be written into file
+            parallel = 1
+        elif filepath is None:
+            raise ValueError('filepath or sink must be set')
+
+        if resume:
+            return await self._download_resumable(
+                path,
+                filepath,
+                headers=headers,
+                cookies=cookies,
+                params=params,
+                timeout=timeout,
+                error_response_models=error_response_models,
+                chunk_size=chunk_size,
+                retry_policy=retry_policy or self._retry_policy,
+                write_batch_size=write_batch_size
+            )
+
+        if parallel > 1:
+            probe = await self._probe_ranges(
+                path,
+                headers=headers,
+                cookies=cookies,
+                params=params,
+                timeout=timeout,
+                error_response_models=error_response_models
+            )
+
+            if probe is not None:
+                size, validator = probe
+                parts = min(parallel, math.ceil(size / part_size))
+
+                if parts > 1:
+                    try:
+                        return await self._download_ranges(
+                            path,
+                            filepath,
+                            size=size,
+                            parts=parts,
+                            validator=validator,
+                            headers=headers,
+                            cookies=cookies,
+                            params=params,
+                            timeout=timeout,
+                            error_response_models=error_response_models,
+                            chunk_size=chunk_size,
+                            write_batch_size=write_batch_size
+                        )
+                    except RangeNotSupportedError as e:
+                        self.logger.debug("Falling back to single stream download of %s: %s", path, e)
+
         return await self.request(
             'GET',
             path,
@@ -108,30 +338,210 @@ class Client:
             error_response_models=error_response_models,
             # Response parse kwargs
             filepath=filepath,
-            chunk_size=chunk_size
+            sink=sink,
+            chunk_size=chunk_size,
+            write_batch_size=write_batch_size
         )
 
+    async def _probe_ranges(
+            self,
+            path: str,
+            *,
+            headers: Headers,
+            cookies: Cookies,
+            params: Params,
+            timeout: Timeout,
+            error_response_models: ErrorResponseModels,
+    ) -> Optional[tuple[int, Optional[str]]]:
+        """Returns content size and validator for If-Range if server supports byte ranges, otherwise None"""
+        try:
+            response = await self.request(
+                'HEAD',
+                path,
+                # Ranges of compressed content would not match ranges of decompressed body
+                headers={**(url_encode_mapping(headers) or {}), 'Accept-Encoding': 'identity'},
+                cookies=cookies,
+                params=params,
+                timeout=timeout,
+                error_response_models=error_response_models,
+                response_class=RawResponseClass
+            )
+        except HTTPError:
+            # HEAD is not allowed, e.g. presigned URL signed for GET only
+            return None
+
+        if response.headers.get('Accept-Ranges', '').lower() != 'bytes':
+            return None
+
+        if response.headers.get('Content-Encoding', 'identity').lower() != 'identity':
+            return None
+
+        try:
+            size = int(response.headers['Content-Length'])
+        except (KeyError, ValueError):
+            return None
+
+        return size, content_validator(response.headers)
+
+    async def _download_ranges(
+            self,
+            path: str,
+            filepath: aiohttp.typedefs.PathLike,
+            *,
+            size: int,
+            parts: int,
+            validator: Optional[str],
+            headers: Headers,
+            cookies: Cookies,
+            params: Params,
+            timeout: Timeout,
+            error_response_models: ErrorResponseModels,
+            chunk_size: int,
+            write_batch_size: int,
+    ) -> aiohttp.typedefs.PathLike:
+        # Parts are written at their offsets into preallocated file
+        async with aiofiles.open(filepath, 'wb') as fd:
+            await fd.truncate(size)
+
+        range_headers = {**(url_encode_mapping(headers) or {}), 'Accept-Encoding': 'identity'}
+
+        if validator is not None:
+            # Server sends whole content instead of range if file has changed since probe
+            range_headers['If-Range'] = validator
+
+        part_size = math.ceil(size / parts)
+        tasks = [
+            asyncio.create_task(self.request(
+                'GET',
+                path,
+                headers={**range_headers, 'Range': f'bytes={start}-{min(start + part_size, size) - 1}'},
+                cookies=cookies,
+                params=params,
+                timeout=timeout,
+                response_class=StreamResponseClass,
+                error_response_models=error_response_models,
+                use_cache=False,
+                # Response parse kwargs
+                filepath=filepath,
+                chunk_size=chunk_size,
+                offset=start,
+                write_batch_size=write_batch_size
+            ))
+            for start in range(0, size, part_size)
+        ]
+
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # Failure of one part cancels the others
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return filepath
+
+    async def _download_resumable(
+            self,
+            path: str,
+            filepath: aiohttp.typedefs.PathLike,
+            *,
+            headers: Headers,
+            cookies: Cookies,
+            params: Params,
+            timeout: Timeout,
+            error_response_models: ErrorResponseModels,
+            chunk_size: int,
+            retry_policy: Optional[RetryPolicy],
+            write_batch_size: int,
+    ) -> aiohttp.typedefs.PathLike:
+        request_params = self._merge_params(params)
+        # Ranges of compressed content would not match ranges of decompressed body
+        request_headers = {**(url_encode_mapping(headers) or {}), 'Accept-Encoding': 'identity'}
+        checkpoint_path = DownloadCheckpoint.path_for(filepath)
+        key = self._request_key('GET', path, request_params, None)
+
+        async def attempt() -> aiohttp.typedefs.PathLike:
+            checkpoint = await DownloadCheckpoint.load(checkpoint_path)
+            attempt_headers = request_headers
+            resume_from = 0
+
+            if checkpoint is not None and checkpoint.key == key and checkpoint.validator is not None:
+                with contextlib.suppress(FileNotFoundError):
+                    resume_from = (await aiofiles.os.stat(filepath)).st_size
+
+                if checkpoint.size is not None and resume_from >= checkpoint.size:
+                    # Complete file whose checkpoint was not removed, range past the end is not satisfiable
+                    resume_from = checkpoint.size - 1
+
+            if resume_from > 0:
+                # Server sends whole content instead of range if it has changed since checkpoint
+                attempt_headers = {
+                    **request_headers,
+                    'Range': f'bytes={resume_from}-',
+                    'If-Range': checkpoint.validator
+                }
+            else:
+                checkpoint = DownloadCheckpoint(key)
+
+            return await self._send(
+                'GET',
+                path,
+                json_body=None,
+                data=None,
+                headers=attempt_headers,
+                cookies=url_encode_mapping(cookies),
+                params=request_params or None,
+                response_model=None,
+                timeout=timeout,
+                error_response_models=error_response_models,
+                response_class=ResumableStreamResponseClass,
+                response_class_parse_kwargs={
+                    'filepath': filepath,
+                    'chunk_size': chunk_size,
+                    'resume_from': resume_from,
+                    'checkpoint': checkpoint,
+                    'write_batch_size': write_batch_size,
+                }
+            )
+
+        return await self._execute('GET', attempt, retry_policy)
+
     async def upload_file(
             self,
             path: str,
-            file: aiohttp.typedefs.PathLike,
+            file: aiohttp.typedefs.PathLike = None,
             *,
             form_key: str = 'file',
+            files: UploadFiles = None,
+            fields: Params = None,
+            chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
             headers: Headers = None,
             cookies: Cookies = None,
             params: Params = None,
             response_model: Type[ResponseType] = None,
-            timeout: int = 300,  # Default in aiohttp
+            timeout: Timeout = None,
             error_response_models: ErrorResponseModels = None,
             response_class: Type[ResponseClass] = None,
     ) -> Optional[ResponseType]:
+        """
+        Uploads ``file`` as ``form_key`` part of multipart form together with other ``files`` and ``fields``.
+        Files are read asynchronously by ``chunk_size`` bytes while request is sent
+        """
+        upload_files = dict(files or {})
+
+        if file is not None:
+            upload_files[form_key] = file
+
+        if not bool(upload_files):
+            raise ValueError('file or files must be set')
+
         return await self.post(
             path,
             headers=headers,
             cookies=cookies,
             params=params,
-            # TODO: aiofiles?
-            data={form_key: open(file, 'rb')},
+            data=await multipart_body(upload_files, fields, chunk_size=chunk_size),
             response_model=response_model,
             timeout=timeout,
             error_response_models=error_response_models,
@@ -143,11 +553,12 @@ class Client:
             path: str,
             file: aiohttp.typedefs.PathLike,
             *,
+            chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
             headers: Headers = None,
             cookies: Cookies = None,
             params: Params = None,
             response_model: Type[ResponseType] = None,
-            timeout: int = 300,  # Default in aiohttp
+            timeout: Timeout = None,
             error_response_models: ErrorResponseModels = None,
             response_class: Type[ResponseClass] = None,
     ) -> Optional[ResponseType]:
@@ -156,13 +567,327 @@ class Client:
             headers=headers,
             cookies=cookies,
             params=params,
-            data=read_file_by_chunk(file),
+            data=await FilePayload.from_path(file, chunk_size=chunk_size),
             response_model=response_model,
             timeout=timeout,
             error_response_models=error_response_models,
             response_class=response_class
         )
 
+    def _merge_params(self, params: Params) -> dict:
+        if bool(params):
+            return {**self._params, **url_encode_mapping(params)}
+
+        return self._params
+
+    def _request_key(
+            self,
+            method: str,
+            path: str,
+            params: dict,
+            headers: Optional[dict],
+            cookies: Optional[dict] = None,
+    ) -> str:
+        return ResponseCache.build_key(
+            method,
+            str(self._build_url(path)),
+            params,
+            {**self._headers, **(headers or {})},
+            {**self._cookies, **(cookies or {})}
+        )
+
+    def _refresh_in_background(self, cache_key: str, execute: Callable[[], Awaitable[Any]]):
+        if cache_key in self._refresh_tasks:
+            # Only one refresh per entry at a time
+            return
+
+        # Refresh outlives request which triggered it, so it is not bound by its deadline
+        task = context_with_deadline(None).run(asyncio.create_task, self._refresh_cache_entry(cache_key, execute))
+        self._refresh_tasks[cache_key] = task
+        task.add_done_callback(lambda _: self._refresh_tasks.pop(cache_key, None))
+
+    async def _refresh_cache_entry(self, cache_key: str, execute: Callable[[], Awaitable[Any]]):
+        try:
+            await execute()
+        except Exception as e:
+            self._cache.record_refresh(cache_key, e)
+            self.logger.warning(
+                "Refresh of cached response failed (%d in a row): %r",
+                self._cache.refresh_failures[cache_key],
+                e
+            )
+        else:
+            self._cache.record_refresh(cache_key)
+
+    def keep_fresh(
+            self,
+            spec: RequestSpec,
+            *,
+            refresh_ahead: float = 1.0,
+            min_interval: float = 1.0,
+    ) -> asyncio.Task:
+        """
+        Keeps cached response of ``spec`` fresh by revalidating it ``refresh_ahead`` seconds before it expires,
+        but not more often than every ``min_interval`` seconds. Cancel returned task to stop refreshing
+        """
+        if self._cache is None:
+            raise ValueError('cache is not set')
+
+        task = context_with_deadline(None).run(asyncio.create_task, self._keep_fresh(spec, refresh_ahead, min_interval))
+        self._keep_fresh_tasks.add(task)
+        task.add_done_callback(self._keep_fresh_tasks.discard)
+        return task
+
+    async def _keep_fresh(self, spec: RequestSpec, refresh_ahead: float, min_interval: float):
+        cache_key = self._request_key(
+            spec.method,
+            spec.path,
+            self._merge_params(spec.params),
+            url_encode_mapping(spec.headers),
+            url_encode_mapping(spec.cookies)
+        )
+        spec = dataclasses.replace(spec, kwargs={**spec.kwargs, 'revalidate': True})
+
+        while True:
+            delay = min_interval
+
+            try:
+                await self._execute_spec(spec)
+            except Exception as e:
+                self._cache.record_refresh(cache_key, e)
+                self.logger.warning(
+                    "Refresh of %s %s failed (%d in a row): %r",
+                    spec.method,
+                    spec.path,
+                    self._cache.refresh_failures[cache_key],
+                    e
+                )
+            else:
+                self._cache.record_refresh(cache_key)
+                entry = await self._cache.get(cache_key)
+
+                if entry is not None:
+                    delay = max(entry.expires_at - time.time() - refresh_ahead, min_interval)
+
+            await asyncio.sleep(delay)
+
+    def _cached_value(
+            self,
+            entry: CacheEntry,
+            response_class: Type[ResponseClass],
+            response_model: Type[ResponseType],
+            response_class_parse_kwargs: dict[str, Any],
+    ) -> Optional[ResponseType]:
+        value_key = (response_class, response_model)
+
+        if entry.value_key != value_key:
+            # Entry loaded from persistent backend or parsed with another model
+            entry.value = response_class(None, json_backend=self._json_backend).parse_body(
+                entry.body,
+                response_model=response_model,
+                **response_class_parse_kwargs
+            )
+            entry.value_key = value_key
+
+        return entry.value
+
+    async def _store_cached_value(
+            self,
+            cache_key: str,
+            response: aiohttp.ClientResponse,
+            value: Any,
+            response_class: Type[ResponseClass],
+            response_model: Type[ResponseType],
+    ):
+        # Body is already read by response class, aiohttp keeps it
+        entry = self._cache.entry_from_response(response.headers, await response.read())
+
+        if entry is not None:
+            entry.value = value
+            entry.value_key = (response_class, response_model)
+            await self._cache.set(cache_key, entry)
+
+    async def _send(
+            self,
+            method: str,
+            path: str,
+            *,
+            json_body: Optional[bytes],
+            data: Any,
+            headers: Optional[dict],
+            cookies: Optional[dict],
+            params: Optional[dict],
+            response_model: Type[ResponseType],
+            timeout: Timeout,
+            error_response_models: ErrorResponseModels,
+            response_class: Type[ResponseClass],
+            response_class_parse_kwargs: dict[str, Any],
+            cache_key: Optional[str] = None,
+            cache_entry: Optional[CacheEntry] = None,
+            priority: int = Priority.NORMAL,
+    ) -> Optional[ResponseType]:
+        if json_body is not None:
+            # New payload for every attempt, so request could be sent again on retry
+            data = aiohttp.BytesPayload(json_body, content_type='application/json')
+
+        self._check_deadline()
+        timeouts = resolve_timeouts(self._timeouts, timeout)
+        url = self._build_url(path)
+        endpoint = circuit = None
+
+        with contextlib.ExitStack() as stack:
+            # Entered first, so circuit breaker and load balancer still see the timeout itself
+            stack.enter_context(deadline_timeouts())
+
+            if self._load_balancer is not None and not url.absolute:
+                # Endpoint is picked before waiting in queues below, since rate limits and circuits are per host
+                endpoint = stack.enter_context(self._load_balancer.reserve())
+                url = endpoint.url.join(url)
+
+            if self._circuit_breaker is not None:
+                circuit = self._circuit_breaker.circuit_for(url)
+                # Fail fast without waiting for rate limiter
+                circuit.raise_if_open()
+
+            if self._rate_limiter is not None:
+                # Waiting happens before connection is acquired from pool
+                await self._rate_limiter.acquire(url)
+
+            if self._concurrency_limiter is not None:
+                await self._concurrency_limiter.acquire()
+                stack.enter_context(self._concurrency_limiter.track())
+
+            if self._scheduler is not None:
+                # Waits last, so priority decides which request gets next free connection
+                await self._scheduler.acquire(priority, get_deadline())
+                stack.enter_context(self._scheduler.track(priority))
+
+            # Time spent waiting in queues above counts towards deadline
+            client_timeout = timeouts.client_timeout(self._check_deadline())
+
+            if circuit is not None:
+                stack.enter_context(circuit.track())
+
+            if endpoint is not None:
+                stack.enter_context(self._load_balancer.track(endpoint))
+
+            request = self._session.request(
+                method,
+                url,
+                headers=headers,
+                cookies=cookies,
+                params=params,
+                data=data,
+                timeout=client_timeout
+            )
+
+            if timeouts.first_byte is not None:
+                response = await asyncio.wait_for(request, timeouts.first_byte)
+            else:
+                response = await request
+
+            async with response:
+                if self._rate_limiter is not None:
+                    self._rate_limiter.update(url, response.headers)
+
+                if cache_entry is not None and response.status == http.HTTPStatus.NOT_MODIFIED:
+                    revalidated_entry = self._cache.revalidated(cache_entry, response.headers)
+
+                    if revalidated_entry is not None:
+                        self._cache.stats.revalidated += 1
+                        await self._cache.set(cache_key, revalidated_entry)
+                        return self._cached_value(
+                            revalidated_entry,
+                            response_class,
+                            response_model,
+                            response_class_parse_kwargs
+                        )
+
+                    await self._cache.delete(cache_key)
+                elif response.ok:
+                    value = await response_class(response, json_backend=self._json_backend).parse(
+                        response_model=response_model,
+                        **response_class_parse_kwargs
+                    )
+
+                    if cache_key is not None and response.status == http.HTTPStatus.OK:
+                        await self._store_cached_value(cache_key, response, value, response_class, response_model)
+
+                    return value
+                else:
+                    return await self._parse_response_error(response, error_response_models=error_response_models)
+
+        # Cached body must not be reused, so it is requested again without validators once all slots are released
+        validators = self._cache.conditional_headers(cache_entry)
+        return await self._send(
+            method,
+            path,
+            json_body=json_body,
+            data=data,
+            headers={name: value for name, value in headers.items() if name not in validators} or None,
+            cookies=cookies,
+            params=params,
+            response_model=response_model,
+            timeout=timeout,
+            error_response_models=error_response_models,
+            response_class=response_class,
+            response_class_parse_kwargs=response_class_parse_kwargs,
+            cache_key=cache_key,
+            priority=priority,
+        )
+
+    @staticmethod
+    def _check_deadline() -> Optional[float]:
+        """Returns time remaining before deadline, raises if deadline has passed"""
+        remaining = remaining_time()
+
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededError('deadline exceeded before request was sent')
+
+        return remaining
+
+    async def _execute(
+            self,
+            method: str,
+            send: Callable[[], Awaitable[ResponseType]],
+            retry_policy: Optional[RetryPolicy],
+    ) -> ResponseType:
+        self._retry_budget.record_request()
+
+        if retry_policy is None:
+            return await send()
+
+        return await self._send_with_retries(method, send, retry_policy)
+
+    async def _send_with_retries(
+            self,
+            method: str,
+            send: Callable[[], Awaitable[ResponseType]],
+            retry_policy: RetryPolicy,
+    ) -> ResponseType:
+        retry = 0
+
+        while True:
+            try:
+                return await send()
+            except Exception as e:
+                if retry + 1 >= retry_policy.attempts or not retry_policy.is_retryable(method, e):
+                    raise
+
+                delay = retry_policy.get_delay(retry, e)
+
+                remaining = remaining_time()
+
+                if delay is None or (remaining is not None and delay >= remaining):
+                    raise
+
+                if not self._retry_budget.try_withdraw():
+                    raise
+
+                self.logger.debug("Retrying %s request in %.3fs after %r", method, delay, e)
+                await asyncio.sleep(delay)
+                retry += 1
+
     async def request(
             self,
             method: str,
@@ -174,9 +899,15 @@ class Client:
             cookies: Cookies = None,
             params: Params = None,
             response_model: Type[ResponseType] = None,
-            timeout: int = 300,  # Default in aiohttp
+            timeout: Timeout = None,
             error_response_models: ErrorResponseModels = None,
             response_class: Type[ResponseClass] = None,
+            retry_policy: RetryPolicy = None,
+            use_cache: bool = True,
+            revalidate: bool = False,
+            coalesce: Optional[bool] = None,
+            hedge_policy: HedgePolicy = None,
+            priority: int = Priority.NORMAL,
             **response_class_parse_kwargs
     ) -> Optional[ResponseType]:
         response_class = response_class or self._response_class
@@ -184,28 +915,124 @@ class Client:
         if not bool(response_class):
             raise ValueError('response_class is not set')
 
-        _params = self._params
+        request_params = self._merge_params(params)
+        json_body = None
 
-        if bool(params):
-            _params.update(model_to_dict(params) or {})
+        if body is not None:
+            if data is not None:
+                raise ValueError('body and data parameters can not be used at the same time')
 
-        async with self._session.request(
+            json_body = encode_body(body, json_backend=self._json_backend)
+
+        request_headers = url_encode_mapping(headers)
+        request_cookies = url_encode_mapping(cookies)
+        request_key = cache_key = cache_entry = None
+        serve_stale = False
+
+        if (
+                use_cache
+                and self._cache is not None
+                and method.upper() in self._cache.methods
+                and data is None
+                and json_body is None
+                and response_class.cacheable
+        ):
+            cache_key = request_key = self._request_key(
                 method,
                 path,
-                headers=url_compatible_encoder(model_to_dict(headers)),
-                cookies=url_compatible_encoder(model_to_dict(cookies)),
-                params=url_compatible_encoder(_params),
-                json=model_to_dict(body),
-                data=data,
-                timeout=aiohttp.ClientTimeout(total=timeout)
-        ) as response:
-            if response.ok:
-                return await response_class(response).parse(
-                    response_model=response_model,
-                    **response_class_parse_kwargs
-                )
+                request_params,
+                request_headers,
+                request_cookies
+            )
+            cache_entry = await self._cache.get(cache_key)
+            now = time.time()
+
+            if cache_entry is not None and not revalidate:
+                if cache_entry.is_fresh(now):
+                    self._cache.stats.hits += 1
+                    return self._cached_value(cache_entry, response_class, response_model, response_class_parse_kwargs)
+
+                serve_stale = cache_entry.is_servable_stale(now)
+
+            if not serve_stale:
+                self._cache.stats.misses += 1
+
+            if cache_entry is not None:
+                request_headers = {**(request_headers or {}), **self._cache.conditional_headers(cache_entry)}
+
+        send = functools.partial(
+            self._send,
+            method,
+            path,
+            json_body=json_body,
+            data=data,
+            headers=request_headers,
+            cookies=request_cookies,
+            params=request_params or None,
+            response_model=response_model,
+            timeout=timeout,
+            error_response_models=error_response_models,
+            response_class=response_class,
+            response_class_parse_kwargs=response_class_parse_kwargs,
+            cache_key=cache_key,
+            cache_entry=cache_entry,
+            priority=priority,
+        )
+        retry_policy = retry_policy or self._retry_policy
+
+        hedge_policy = hedge_policy or self._hedge_policy
+
+        if not is_replayable(data):
+            retry_policy = hedge_policy = None
+
+        if hedge_policy is not None and method.upper() in IDEMPOTENT_METHODS and response_class.cacheable:
+            send = functools.partial(hedge_policy.run, send)
+
+        execute = functools.partial(self._execute, method, send, retry_policy)
+
+        if serve_stale:
+            self._cache.stats.stale_hits += 1
+            self._refresh_in_background(cache_key, execute)
+            return self._cached_value(cache_entry, response_class, response_model, response_class_parse_kwargs)
+
+        if coalesce is None:
+            coalesce = self._coalesce_requests
 
-            return await self._parse_response_error(response, error_response_models=error_response_models)
+        if (
+                coalesce
+                and method.upper() in COALESCED_METHODS
+                and data is None
+                and json_body is None
+                and response_class.cacheable
+                and not response_class_parse_kwargs
+        ):
+            flight_key = (
+                request_key or self._request_key(method, path, request_params, request_headers, request_cookies),
+                response_class,
+                response_model,
+                # Callers share error parsing and every setting of how request is executed
+                tuple(sorted((error_response_models or {}).items())),
+                timeout,
+                retry_policy,
+                hedge_policy,
+                priority,
+                # Callers with different deadlines do not share requests
+                get_deadline(),
+            )
+
+            try:
+                hash(flight_key)
+            except TypeError:
+                # Response or error model can not be compared, e.g. Annotated with unhashable metadata
+                return await execute()
+
+            return await self._single_flight.do(
+                flight_key,
+                execute,
+                context=context_with_deadline(get_deadline())
+            )
+
+        return await execute()
 
     async def get(
             self,
@@ -215,9 +1042,15 @@ class Client:
             cookies: Cookies = None,
             params: Params = None,
             response_model: Type[ResponseType] = None,
-            timeout: int = 300,  # Default in aiohttp
+            timeout: Timeout = None,
             error_response_models: ErrorResponseModels = None,
-            response_class: Type[ResponseClass] = None
+            response_class: Type[ResponseClass] = None,
+            retry_policy: RetryPolicy = None,
+            use_cache: bool = True,
+            revalidate: bool = False,
+            coalesce: Optional[bool] = None,
+            hedge_policy: HedgePolicy = None,
+            priority: int = Priority.NORMAL,
     ) -> Optional[ResponseType]:
         return await self.request(
             "GET",
@@ -228,7 +1061,13 @@ class Client:
             response_model=response_model,
             timeout=timeout,
             error_response_models=error_response_models,
-            response_class=response_class
+            response_class=response_class,
+            retry_policy=retry_policy,
+            use_cache=use_cache,
+            revalidate=revalidate,
+            coalesce=coalesce,
+            hedge_policy=hedge_policy,
+            priority=priority
         )
 
     async def post(
@@ -241,9 +1080,11 @@ class Client:
             cookies: Cookies = None,
             params: Params = None,
             response_model: Type[ResponseType] = None,
-            timeout: int = 300,  # Default in aiohttp
+            timeout: Timeout = None,
             error_response_models: ErrorResponseModels = None,
-            response_class: Type[ResponseClass] = None
+            response_class: Type[ResponseClass] = None,
+            retry_policy: RetryPolicy = None,
+            priority: int = Priority.NORMAL,
     ) -> Optional[ResponseType]:
         return await self.request(
             "POST",
@@ -256,7 +1097,9 @@ class Client:
             response_model=response_model,
             timeout=timeout,
             error_response_models=error_response_models,
-            response_class=response_class
+            response_class=response_class,
+            retry_policy=retry_policy,
+            priority=priority
         )
 
     async def patch(
@@ -269,9 +1112,11 @@ class Client:
             cookies: Cookies = None,
             params: Params = None,
             response_model: Type[ResponseType] = None,
-            timeout: int = 300,  # Default in aiohttp
+            timeout: Timeout = None,
             error_response_models: ErrorResponseModels = None,
-            response_class: Type[ResponseClass] = None
+            response_class: Type[ResponseClass] = None,
+            retry_policy: RetryPolicy = None,
+            priority: int = Priority.NORMAL,
     ) -> Optional[ResponseType]:
         return await self.request(
             "PATCH",
@@ -284,7 +1129,9 @@ class Client:
             response_model=response_model,
             timeout=timeout,
             error_response_models=error_response_models,
-            response_class=response_class
+            response_class=response_class,
+            retry_policy=retry_policy,
+            priority=priority
         )
 
     async def put(
@@ -297,9 +1144,11 @@ class Client:
             cookies: Cookies = None,
             params: Params = None,
             response_model: Type[ResponseType] = None,
-            timeout: int = 300,  # Default in aiohttp
+            timeout: Timeout = None,
             error_response_models: ErrorResponseModels = None,
-            response_class: Type[ResponseClass] = None
+            response_class: Type[ResponseClass] = None,
+            retry_policy: RetryPolicy = None,
+            priority: int = Priority.NORMAL,
     ) -> Optional[ResponseType]:
         return await self.request(
             "PUT",
@@ -312,7 +1161,9 @@ class Client:
             response_model=response_model,
             timeout=timeout,
             error_response_models=error_response_models,
-            response_class=response_class
+            response_class=response_class,
+            retry_policy=retry_policy,
+            priority=priority
         )
 
     async def delete(
@@ -325,9 +1176,11 @@ class Client:
             cookies: Cookies = None,
             params: Params = None,
             response_model: Type[ResponseType] = None,
-            timeout: int = 300,  # Default in aiohttp
+            timeout: Timeout = None,
             error_response_models: ErrorResponseModels = None,
-            response_class: Type[ResponseClass] = None
+            response_class: Type[ResponseClass] = None,
+            retry_policy: RetryPolicy = None,
+            priority: int = Priority.NORMAL,
     ) -> Optional[ResponseType]:
         return await self.request(
             "DELETE",
@@ -340,10 +1193,55 @@ class Client:
             response_model=response_model,
             timeout=timeout,
             error_response_models=error_response_models,
-            response_class=response_class
+            response_class=response_class,
+            retry_policy=retry_policy,
+            priority=priority
+        )
+
+    async def _execute_spec(self, spec: RequestSpec) -> Any:
+        return await self.request(
+            spec.method,
+            spec.path,
+            body=spec.body,
+            data=spec.data,
+            headers=spec.headers,
+            cookies=spec.cookies,
+            params=spec.params,
+            response_model=spec.response_model,
+            timeout=spec.timeout,
+            error_response_models=spec.error_response_models,
+            response_class=spec.response_class,
+            **spec.kwargs
         )
 
+    def map(
+            self,
+            specs: RequestSpecs,
+            *,
+            concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+            ordered: bool = True,
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Executes requests described by ``specs`` (iterable or async iterable of RequestSpec) with bounded concurrency.
+        Yields results in input order or, with ``ordered=False``, as they complete
+        """
+        return run_batch(self._execute_spec, specs, concurrency=concurrency, ordered=ordered)
+
+    async def gather(
+            self,
+            specs: RequestSpecs,
+            *,
+            concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> list[BatchResult]:
+        return [result async for result in self.map(specs, concurrency=concurrency)]
+
     async def close(self):
+        background_tasks = [*self._refresh_tasks.values(), *self._keep_fresh_tasks]
+
+        for task in background_tasks:
+            task.cancel()
+
+        await asyncio.gather(*background_tasks, return_exceptions=True)
         await self._session.close()
 
     async def __aenter__(self):
@@ -0,0 +1,142 @@
+import asyncio
+import contextlib
+import time
+from collections import deque
+from typing import Iterator
+from typing import Optional
+from typing import Type
+
+from .errors import CircuitOpenError
+from .errors import ConcurrencyLimitError
+from .errors import DeadlineExceededError
+from .errors import HTTPServiceUnavailable
+from .errors import HTTPTooManyRequests
+from .errors import matches_error
+
+# Responses showing that upstream is overloaded
+OVERLOAD_ERRORS: tuple[Type[BaseException], ...] = (
+    HTTPTooManyRequests,
+    HTTPServiceUnavailable,
+    asyncio.TimeoutError,
+)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limits number of requests in flight with limit adapted by AIMD: every response received while limit
+    is actually used increases it by ``increase``, while overload responses and latency spikes
+    (latency above ``latency_tolerance`` times long-term average) multiply it by ``backoff_ratio``.
+
+    Requests above the limit wait in FIFO queue of at most ``max_queue_size`` requests for at most
+    ``queue_timeout`` seconds, otherwise ``ConcurrencyLimitError`` is raised.
+    """
+
+    def __init__(
+            self,
+            *,
+            initial_limit: int = 20,
+            min_limit: int = 1,
+            max_limit: int = 1000,
+            increase: float = 1.0,
+            backoff_ratio: float = 0.9,
+            latency_tolerance: float = 2.0,
+            latency_alpha: float = 0.05,
+            max_queue_size: int = 1000,
+            queue_timeout: Optional[float] = None,
+    ):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError('limits must satisfy 1 <= min_limit <= initial_limit <= max_limit')
+        if not 0 < backoff_ratio < 1:
+            raise ValueError('backoff_ratio must be between 0 and 1')
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.latency_alpha = latency_alpha
+        self.max_queue_size = max_queue_size
+        self.queue_timeout = queue_timeout
+        self._limit = float(initial_limit)
+        self._latency: Optional[float] = None
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self):
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+
+        if len(self._waiters) >= self.max_queue_size:
+            raise ConcurrencyLimitError('concurrency limiter queue is full')
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise ConcurrencyLimitError('timed out waiting in concurrency limiter queue') from None
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was granted right before cancellation
+                self._release()
+
+            raise
+        finally:
+            with contextlib.suppress(ValueError):
+                self._waiters.remove(waiter)
+
+    def _release(self):
+        self._in_flight -= 1
+
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+
+            if not waiter.done():
+                waiter.set_result(None)
+                self._in_flight += 1
+
+    def _update_limit(self, latency: float, overloaded: bool):
+        if self._latency is None:
+            self._latency = latency
+
+        spike = latency > self.latency_tolerance * self._latency
+        self._latency += self.latency_alpha * (latency - self._latency)
+
+        if overloaded or spike:
+            self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+        elif self._in_flight * 2 >= self._limit:
+            # Limit is grown only while it is actually used
+            self._limit = min(self.max_limit, self._limit + self.increase)
+
+    @contextlib.contextmanager
+    def track(self) -> Iterator['AdaptiveConcurrencyLimiter']:
+        """Releases slot taken by ``acquire`` and adapts limit to request outcome"""
+        started_at = time.monotonic()
+
+        try:
+            yield self
+        except (asyncio.CancelledError, CircuitOpenError, DeadlineExceededError):
+            # Request outcome tells nothing about upstream load
+            self._release()
+            raise
+        except BaseException as e:
+            self._update_limit(time.monotonic() - started_at, matches_error(e, OVERLOAD_ERRORS))
+            self._release()
+            raise
+        else:
+            self._update_limit(time.monotonic() - started_at, False)
+            self._release()
@@ -112,6 +112,377 @@ def generate_encoders_by_class_tuples(
 
 encoders_by_class_tuples = generate_encoders_by_class_tuples(ENCODERS_BY_TYPE)
 
+_SEQUENCE_TYPES = (list, set, frozenset, GeneratorType, tuple, deque)
+
+# Plan kinds
+_IDENTITY = 0
+_LEAF = 1
+_MODEL = 2
+_DATACLASS = 3
+_DATACLASS_ASDICT = 4
+_DICT = 5
+_SEQUENCE = 6
+_FALLBACK = 7
+
+
+def _enum_value(o: Enum) -> Any:
+    return o.value
+
+
+def _find_custom_encoder(
+        custom_encoder: Dict[Any, Callable[[Any], Any]],
+        obj: Any
+) -> Optional[Callable[[Any], Any]]:
+    if type(obj) in custom_encoder:
+        return custom_encoder[type(obj)]
+
+    for encoder_type, encoder_instance in custom_encoder.items():
+        if isinstance(obj, encoder_type):
+            return encoder_instance
+
+    return None
+
+
+def _fallback_to_dict(obj: Any) -> dict:
+    try:
+        return dict(obj)
+    except Exception as e:
+        errors: List[Exception] = [e]
+        try:
+            return vars(obj)
+        except Exception as e:
+            errors.append(e)
+            raise ValueError(errors) from e
+
+
+class _EncodeOptions:
+    """Encoding parameters of one nesting level. Options of nested levels are derived once and reused"""
+
+    __slots__ = (
+        'include',
+        'exclude',
+        'by_alias',
+        'exclude_unset',
+        'exclude_defaults',
+        'exclude_none',
+        'custom_encoder',
+        'sqlalchemy_safe',
+        'model_exclude_unset',
+        '_dict_child',
+        '_model_child',
+    )
+
+    def __init__(
+            self,
+            include: Optional[IncEx],
+            exclude: Optional[IncEx],
+            by_alias: bool,
+            exclude_unset: bool,
+            exclude_defaults: bool,
+            exclude_none: bool,
+            custom_encoder: Dict[Any, Callable[[Any], Any]],
+            sqlalchemy_safe: bool,
+            model_exclude_unset: bool,
+    ):
+        if include is not None and not isinstance(include, (set, dict)):
+            include = set(include)
+        if exclude is not None and not isinstance(exclude, (set, dict)):
+            exclude = set(exclude)
+
+        self.include = include
+        self.exclude = exclude
+        self.by_alias = by_alias
+        self.exclude_unset = exclude_unset
+        self.exclude_defaults = exclude_defaults
+        self.exclude_none = exclude_none
+        self.custom_encoder = custom_encoder
+        self.sqlalchemy_safe = sqlalchemy_safe
+        # Default value of exclude_unset of public encoder function, used for dumped model content
+        self.model_exclude_unset = model_exclude_unset
+        self._dict_child = None
+        self._model_child = None
+
+    @property
+    def dict_child(self) -> '_EncodeOptions':
+        # Keys and values of dict are encoded without include, exclude and exclude_defaults
+        if self._dict_child is None:
+            self._dict_child = _EncodeOptions(
+                include=None,
+                exclude=None,
+                by_alias=self.by_alias,
+                exclude_unset=self.exclude_unset,
+                exclude_defaults=False,
+                exclude_none=self.exclude_none,
+                custom_encoder=self.custom_encoder,
+                sqlalchemy_safe=self.sqlalchemy_safe,
+                model_exclude_unset=self.model_exclude_unset,
+            )
+
+        return self._dict_child
+
+    @property
+    def model_child(self) -> '_EncodeOptions':
+        # Dumped model content is encoded with default parameters except exclude_none and exclude_defaults
+        if self._model_child is None:
+            self._model_child = _EncodeOptions(
+                include=None,
+                exclude=None,
+                by_alias=True,
+                exclude_unset=self.model_exclude_unset,
+                exclude_defaults=self.exclude_defaults,
+                exclude_none=self.exclude_none,
+                custom_encoder={},
+                sqlalchemy_safe=self.sqlalchemy_safe,
+                model_exclude_unset=self.model_exclude_unset,
+            )
+
+        return self._model_child
+
+
+class _CompiledEncoder:
+    """
+    Iterative encoder which resolves encoding plan once per concrete type.
+
+    Plans of leaf values (scalars, enums, paths, ENCODERS_BY_TYPE entries) are applied inline while walking
+    containers, models and dataclasses are transformed into dicts, and containers are expanded through
+    an explicit stack instead of python recursion.
+    If ENCODERS_BY_TYPE is modified at runtime, call ``clear_encoders_cache`` to drop already resolved plans.
+    """
+
+    def __init__(
+            self,
+            resolve_scalar: Callable[[Any], Optional[tuple[int, Any]]],
+            skip_empty_keys: bool,
+            exclude_unset: bool,
+    ):
+        self._resolve_scalar = resolve_scalar
+        self._skip_empty_keys = skip_empty_keys
+        self.exclude_unset = exclude_unset
+        self._plans: Dict[type, tuple[int, Any]] = {}
+
+    def clear(self):
+        self._plans.clear()
+
+    def _resolve(self, obj: Any) -> tuple[int, Any]:
+        if isinstance(obj, BaseModel):
+            return _MODEL, None
+        if dataclasses.is_dataclass(obj):
+            if isinstance(obj, type):
+                # Keep dataclasses.asdict error for dataclass types passed as values
+                return _DATACLASS_ASDICT, None
+
+            return _DATACLASS, tuple(field.name for field in dataclasses.fields(obj))
+        if isinstance(obj, Enum):
+            return _LEAF, _enum_value
+        if isinstance(obj, PurePath):
+            return _LEAF, str
+
+        scalar_plan = self._resolve_scalar(obj)
+
+        if scalar_plan is not None:
+            return scalar_plan
+        if isinstance(obj, dict):
+            return _DICT, None
+        if isinstance(obj, _SEQUENCE_TYPES):
+            return _SEQUENCE, None
+        if type(obj) in ENCODERS_BY_TYPE:
+            return _LEAF, ENCODERS_BY_TYPE[type(obj)]
+        for encoder, classes_tuple in encoders_by_class_tuples.items():
+            if isinstance(obj, classes_tuple):
+                return _LEAF, encoder
+
+        return _FALLBACK, None
+
+    def _plan(self, obj: Any) -> tuple[int, Any]:
+        plan = self._plans.get(type(obj))
+
+        if plan is None:
+            plan = self._resolve(obj)
+
+            if not isinstance(obj, type):
+                # Classes passed as values are resolved by value every time
+                self._plans[type(obj)] = plan
+
+        return plan
+
+    def encode(self, obj: Any, options: _EncodeOptions) -> Any:
+        root = [None]
+        # (value, options, container to store encoded value, key or index in container)
+        stack = [(obj, options, root, 0)]
+
+        while stack:
+            obj, options, target, slot = stack.pop()
+
+            while True:
+                if options.custom_encoder:
+                    encoder = _find_custom_encoder(options.custom_encoder, obj)
+
+                    if encoder is not None:
+                        target[slot] = encoder(obj)
+                        break
+
+                kind, arg = self._plan(obj)
+
+                if kind == _IDENTITY:
+                    target[slot] = obj
+                    break
+                if kind == _LEAF:
+                    target[slot] = arg(obj)
+                    break
+                if kind == _DICT:
+                    target[slot] = self._encode_dict(obj, options, stack)
+                    break
+                if kind == _SEQUENCE:
+                    target[slot] = self._encode_sequence(obj, options, stack)
+                    break
+
+                # Transformations below produce a new value which is encoded in place of original one
+                if kind == _MODEL:
+                    obj = _model_dump(
+                        obj,
+                        mode="json",
+                        include=options.include,
+                        exclude=options.exclude,
+                        by_alias=options.by_alias,
+                        exclude_unset=options.exclude_unset,
+                        exclude_none=options.exclude_none,
+                        exclude_defaults=options.exclude_defaults,
+                    )
+                    if "__root__" in obj:
+                        obj = obj["__root__"]
+                    options = options.model_child
+                elif kind == _DATACLASS:
+                    if options.custom_encoder:
+                        # Nested dataclasses must not reach custom encoders, same as with dataclasses.asdict
+                        obj = dataclasses.asdict(obj)
+                    else:
+                        # Nested values are converted by their own plans, so deep copy made by asdict is not needed
+                        obj = {name: getattr(obj, name) for name in arg}
+                elif kind == _DATACLASS_ASDICT:
+                    obj = dataclasses.asdict(obj)
+                else:
+                    obj = _fallback_to_dict(obj)
+
+        return root[0]
+
+    def _encode_dict(self, obj: dict, options: _EncodeOptions, stack: list) -> dict:
+        allowed_keys = None
+
+        if options.include is not None or options.exclude is not None:
+            allowed_keys = set(obj.keys())
+            if options.include is not None:
+                allowed_keys &= set(options.include)
+            if options.exclude is not None:
+                allowed_keys -= set(options.exclude)
+
+        child_options = options.dict_child
+        has_custom_encoder = bool(child_options.custom_encoder)
+        sqlalchemy_safe = options.sqlalchemy_safe
+        exclude_none = options.exclude_none
+        skip_empty_keys = self._skip_empty_keys
+        plans = self._plans
+        encoded_dict = {}
+        pending = []
+
+        for key, value in obj.items():
+            if sqlalchemy_safe and isinstance(key, str) and key.startswith("_sa"):
+                continue
+            if value is None and exclude_none:
+                continue
+            if allowed_keys is not None and key not in allowed_keys:
+                continue
+
+            plan = None if has_custom_encoder else plans.get(type(key))
+
+            if plan is not None and plan[0] == _IDENTITY:
+                encoded_key = key
+            elif plan is not None and plan[0] == _LEAF:
+                encoded_key = plan[1](key)
+            else:
+                encoded_key = self.encode(key, child_options)
+
+            if skip_empty_keys and not bool(encoded_key):
+                # '' or None
+                continue
+
+            if encoded_key in encoded_dict and pending:
+                # Several keys encoded to the same value, the last one wins
+                pending = [task for task in pending if task[3] != encoded_key]
+
+            plan = None if has_custom_encoder else plans.get(type(value))
+
+            if plan is not None and plan[0] == _IDENTITY:
+                encoded_dict[encoded_key] = value
+            elif plan is not None and plan[0] == _LEAF:
+                encoded_dict[encoded_key] = plan[1](value)
+            else:
+                # Placeholder keeps keys order
+                encoded_dict[encoded_key] = None
+                pending.append((value, child_options, encoded_dict, encoded_key))
+
+        # Reversed, so items are encoded in their original order
+        stack.extend(reversed(pending))
+        return encoded_dict
+
+    def _encode_sequence(self, obj: Any, options: _EncodeOptions, stack: list) -> list:
+        if not isinstance(obj, (list, tuple)):
+            obj = list(obj)
+
+        has_custom_encoder = bool(options.custom_encoder)
+        plans = self._plans
+        encoded_list = [None] * len(obj)
+        pending = []
+
+        for index, item in enumerate(obj):
+            plan = None if has_custom_encoder else plans.get(type(item))
+
+            if plan is not None and plan[0] == _IDENTITY:
+                encoded_list[index] = item
+            elif plan is not None and plan[0] == _LEAF:
+                encoded_list[index] = plan[1](item)
+            else:
+                pending.append((item, options, encoded_list, index))
+
+        stack.extend(reversed(pending))
+        return encoded_list
+
+
+def _resolve_jsonable_scalar(obj: Any) -> Optional[tuple[int, Any]]:
+    if isinstance(obj, (str, int, float, type(None))):
+        return _IDENTITY, None
+
+    return None
+
+
+def _url_compatible_none(obj: None) -> str:
+    return ""
+
+
+def _url_compatible_bool(obj: bool) -> str:
+    return str(obj).lower()
+
+
+def _resolve_url_compatible_scalar(obj: Any) -> Optional[tuple[int, Any]]:
+    if isinstance(obj, type(None)):
+        return _LEAF, _url_compatible_none
+    if isinstance(obj, str):
+        return _IDENTITY, None
+    if isinstance(obj, bool):
+        return _LEAF, _url_compatible_bool
+    if isinstance(obj, (int, float)):
+        return _LEAF, str
+
+    return None
+
+
+_jsonable_encoder = _CompiledEncoder(_resolve_jsonable_scalar, skip_empty_keys=False, exclude_unset=False)
+_url_compatible_encoder = _CompiledEncoder(_resolve_url_compatible_scalar, skip_empty_keys=True, exclude_unset=True)
+
+
+def clear_encoders_cache():
+    _jsonable_encoder.clear()
+    _url_compatible_encoder.clear()
+
 
 def jsonable_encoder(
         obj: Any,
@@ -124,142 +495,20 @@ def jsonable_encoder(
         custom_encoder: Optional[Dict[Any, Callable[[Any], Any]]] = None,
         sqlalchemy_safe: bool = True,
 ) -> Any:
-    custom_encoder = custom_encoder or {}
-    if custom_encoder:
-        if type(obj) in custom_encoder:
-            return custom_encoder[type(obj)](obj)
-        else:
-            for encoder_type, encoder_instance in custom_encoder.items():
-                if isinstance(obj, encoder_type):
-                    return encoder_instance(obj)
-    if include is not None and not isinstance(include, (set, dict)):
-        include = set(include)
-    if exclude is not None and not isinstance(exclude, (set, dict)):
-        exclude = set(exclude)
-    if isinstance(obj, BaseModel):
-        encoders: Dict[Any, Any] = {}
-        obj_dict = _model_dump(
-            obj,
-            mode="json",
-            include=include,
-            exclude=exclude,
-            by_alias=by_alias,
-            exclude_unset=exclude_unset,
-            exclude_none=exclude_none,
-            exclude_defaults=exclude_defaults,
-        )
-        if "__root__" in obj_dict:
-            obj_dict = obj_dict["__root__"]
-        return jsonable_encoder(
-            obj_dict,
-            exclude_none=exclude_none,
-            exclude_defaults=exclude_defaults,
-            # TODO: remove when deprecating Pydantic v1
-            custom_encoder=encoders,
-            sqlalchemy_safe=sqlalchemy_safe,
-        )
-    if dataclasses.is_dataclass(obj):
-        obj_dict = dataclasses.asdict(obj)
-        return jsonable_encoder(
-            obj_dict,
-            include=include,
-            exclude=exclude,
-            by_alias=by_alias,
-            exclude_unset=exclude_unset,
-            exclude_defaults=exclude_defaults,
-            exclude_none=exclude_none,
-            custom_encoder=custom_encoder,
-            sqlalchemy_safe=sqlalchemy_safe,
-        )
-    if isinstance(obj, Enum):
-        return obj.value
-    if isinstance(obj, PurePath):
-        return str(obj)
-    if isinstance(obj, (str, int, float, type(None))):
-        return obj
-    if isinstance(obj, dict):
-        encoded_dict = {}
-        allowed_keys = set(obj.keys())
-        if include is not None:
-            allowed_keys &= set(include)
-        if exclude is not None:
-            allowed_keys -= set(exclude)
-        for key, value in obj.items():
-            if (
-                    (
-                            not sqlalchemy_safe
-                            or (not isinstance(key, str))
-                            or (not key.startswith("_sa"))
-                    )
-                    and (value is not None or not exclude_none)
-                    and key in allowed_keys
-            ):
-                encoded_key = jsonable_encoder(
-                    key,
-                    by_alias=by_alias,
-                    exclude_unset=exclude_unset,
-                    exclude_none=exclude_none,
-                    custom_encoder=custom_encoder,
-                    sqlalchemy_safe=sqlalchemy_safe,
-                )
-                encoded_value = jsonable_encoder(
-                    value,
-                    by_alias=by_alias,
-                    exclude_unset=exclude_unset,
-                    exclude_none=exclude_none,
-                    custom_encoder=custom_encoder,
-                    sqlalchemy_safe=sqlalchemy_safe,
-                )
-                encoded_dict[encoded_key] = encoded_value
-        return encoded_dict
-    if isinstance(obj, (list, set, frozenset, GeneratorType, tuple, deque)):
-        encoded_list = []
-        for item in obj:
-            encoded_list.append(
-                jsonable_encoder(
-                    item,
-                    include=include,
-                    exclude=exclude,
-                    by_alias=by_alias,
-                    exclude_unset=exclude_unset,
-                    exclude_defaults=exclude_defaults,
-                    exclude_none=exclude_none,
-                    custom_encoder=custom_encoder,
-                    sqlalchemy_safe=sqlalchemy_safe,
-                )
-            )
-        return encoded_list
-
-    if type(obj) in ENCODERS_BY_TYPE:
-        return ENCODERS_BY_TYPE[type(obj)](obj)
-    for encoder, classes_tuple in encoders_by_class_tuples.items():
-        if isinstance(obj, classes_tuple):
-            return encoder(obj)
-
-    try:
-        data = dict(obj)
-    except Exception as e:
-        errors: List[Exception] = [e]
-        try:
-            data = vars(obj)
-        except Exception as e:
-            errors.append(e)
-            raise ValueError(errors) from e
-
-    return jsonable_encoder(
-        data,
+    options = _EncodeOptions(
         include=include,
         exclude=exclude,
         by_alias=by_alias,
         exclude_unset=exclude_unset,
         exclude_defaults=exclude_defaults,
         exclude_none=exclude_none,
-        custom_encoder=custom_encoder,
+        custom_encoder=custom_encoder or {},
         sqlalchemy_safe=sqlalchemy_safe,
+        model_exclude_unset=_jsonable_encoder.exclude_unset,
     )
+    return _jsonable_encoder.encode(obj, options)
 
 
-# noinspection DuplicatedCode
 def url_compatible_encoder(
         obj: Any,
         include: Optional[IncEx] = None,
@@ -271,147 +520,15 @@ def url_compatible_encoder(
         custom_encoder: Optional[Dict[Any, Callable[[Any], Any]]] = None,
         sqlalchemy_safe: bool = True,
 ) -> str | list[str] | dict[str, str | list[str]]:
-    custom_encoder = custom_encoder or {}
-    if custom_encoder:
-        if type(obj) in custom_encoder:
-            return custom_encoder[type(obj)](obj)
-        else:
-            for encoder_type, encoder_instance in custom_encoder.items():
-                if isinstance(obj, encoder_type):
-                    return encoder_instance(obj)
-    if include is not None and not isinstance(include, (set, dict)):
-        include = set(include)
-    if exclude is not None and not isinstance(exclude, (set, dict)):
-        exclude = set(exclude)
-    if isinstance(obj, BaseModel):
-        encoders: Dict[Any, Any] = {}
-        obj_dict = _model_dump(
-            obj,
-            mode="json",
-            include=include,
-            exclude=exclude,
-            by_alias=by_alias,
-            exclude_unset=exclude_unset,
-            exclude_none=exclude_none,
-            exclude_defaults=exclude_defaults,
-        )
-        if "__root__" in obj_dict:
-            obj_dict = obj_dict["__root__"]
-        return url_compatible_encoder(
-            obj_dict,
-            exclude_none=exclude_none,
-            exclude_defaults=exclude_defaults,
-            # TODO: remove when deprecating Pydantic v1
-            custom_encoder=encoders,
-            sqlalchemy_safe=sqlalchemy_safe,
-        )
-    if dataclasses.is_dataclass(obj):
-        obj_dict = dataclasses.asdict(obj)
-        return url_compatible_encoder(
-            obj_dict,
-            include=include,
-            exclude=exclude,
-            by_alias=by_alias,
-            exclude_unset=exclude_unset,
-            exclude_defaults=exclude_defaults,
-            exclude_none=exclude_none,
-            custom_encoder=custom_encoder,
-            sqlalchemy_safe=sqlalchemy_safe,
-        )
-    if isinstance(obj, Enum):
-        return obj.value
-    if isinstance(obj, PurePath):
-        return str(obj)
-    if isinstance(obj, type(None)):
-        return ""
-    if isinstance(obj, str):
-        return obj
-    if isinstance(obj, bool):
-        return str(obj).lower()
-    if isinstance(obj, (int, float)):
-        return str(obj)
-    if isinstance(obj, dict):
-        encoded_dict = {}
-        allowed_keys = set(obj.keys())
-        if include is not None:
-            allowed_keys &= set(include)
-        if exclude is not None:
-            allowed_keys -= set(exclude)
-        for key, value in obj.items():
-            if (
-                    (
-                            not sqlalchemy_safe
-                            or (not isinstance(key, str))
-                            or (not key.startswith("_sa"))
-                    )
-                    and (value is not None or not exclude_none)
-                    and key in allowed_keys
-            ):
-                encoded_key = url_compatible_encoder(
-                    key,
-                    by_alias=by_alias,
-                    exclude_unset=exclude_unset,
-                    exclude_none=exclude_none,
-                    custom_encoder=custom_encoder,
-                    sqlalchemy_safe=sqlalchemy_safe,
-                )
-                encoded_value = url_compatible_encoder(
-                    value,
-                    by_alias=by_alias,
-                    exclude_unset=exclude_unset,
-                    exclude_none=exclude_none,
-                    custom_encoder=custom_encoder,
-                    sqlalchemy_safe=sqlalchemy_safe,
-                )
-
-                if not bool(encoded_key):
-                    # '' or None
-                    continue
-
-                encoded_dict[encoded_key] = encoded_value
-        return encoded_dict
-    if isinstance(obj, (list, set, frozenset, GeneratorType, tuple, deque)):
-        encoded_list = []
-        for item in obj:
-            encoded_list.append(
-                url_compatible_encoder(
-                    item,
-                    include=include,
-                    exclude=exclude,
-                    by_alias=by_alias,
-                    exclude_unset=exclude_unset,
-                    exclude_defaults=exclude_defaults,
-                    exclude_none=exclude_none,
-                    custom_encoder=custom_encoder,
-                    sqlalchemy_safe=sqlalchemy_safe,
-                )
-            )
-        return encoded_list
-
-    if type(obj) in ENCODERS_BY_TYPE:
-        return ENCODERS_BY_TYPE[type(obj)](obj)
-    for encoder, classes_tuple in encoders_by_class_tuples.items():
-        if isinstance(obj, classes_tuple):
-            return encoder(obj)
-
-    try:
-        data = dict(obj)
-    except Exception as e:
-        errors: List[Exception] = [e]
-        try:
-            data = vars(obj)
-        except Exception as e:
-            errors.append(e)
-            raise ValueError(errors) from e
-
-    return url_compatible_encoder(
-        data,
+    options = _EncodeOptions(
         include=include,
         exclude=exclude,
         by_alias=by_alias,
         exclude_unset=exclude_unset,
         exclude_defaults=exclude_defaults,
         exclude_none=exclude_none,
-        custom_encoder=custom_encoder,
+        custom_encoder=custom_encoder or {},
         sqlalchemy_safe=sqlalchemy_safe,
+        model_exclude_unset=_url_compatible_encoder.exclude_unset,
     )
+    return _url_compatible_encoder.encode(obj, options)
@@ -1,4 +1,7 @@
 import http
+from typing import Mapping
+from typing import Optional
+from typing import Type
 from typing import Union
 
 import pydantic
@@ -12,16 +15,56 @@ class ClientError(Exception):
 
 
 class ResponseParseError(ClientError):
-    def __init__(self, raw_response: RawResponse):
+    def __init__(
+            self,
+            raw_response: RawResponse,
+            *,
+            status_code: int = None,
+            headers: Mapping[str, str] = None,
+    ):
         self.raw_response = raw_response
+        self.status_code = status_code
+        self.headers = headers
+
+
+class CircuitOpenError(ClientError):
+    def __init__(self, circuit: tuple, *, retry_after: float = None):
+        super().__init__(circuit)
+        self.circuit = circuit
+        # Seconds until circuit lets trial requests through
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimitError(ClientError):
+    """Request was rejected by concurrency limiter because its queue was full or waiting timed out"""
+
+
+class DeadlineExceededError(ClientError):
+    """Deadline set with ``deadline()`` passed before request was sent or while it was in flight"""
+
+
+class RangeNotSupportedError(ClientError):
+    """Server responded with whole content instead of requested byte range"""
+
+
+class ChecksumMismatchError(ClientError):
+    """Digest of downloaded content does not match expected one"""
+
+    def __init__(self, algorithm: str, expected: str, actual: str):
+        super().__init__(f'{algorithm} digest mismatch: expected {expected}, got {actual}')
+        self.algorithm = algorithm
+        self.expected = expected
+        self.actual = actual
 
 
 class HTTPError(Exception):
     status_code: int = None
     response: Response = None
+    headers: Optional[Mapping[str, str]] = None
 
-    def __init__(self, response: Response):
+    def __init__(self, response: Response, *, headers: Mapping[str, str] = None):
         self.response = response
+        self.headers = headers
 
 
 class HTTPRedirect(HTTPError):
@@ -289,3 +332,14 @@ errors_classes = {
     http.HTTPStatus.NOT_EXTENDED: HTTPNotExtended,
     http.HTTPStatus.NETWORK_AUTHENTICATION_REQUIRED: HTTPNetworkAuthenticationRequired,
 }
+
+
+def matches_error(error: BaseException, types: Union[Type[BaseException], tuple[Type[BaseException], ...]]) -> bool:
+    """
+    Whether ``error`` is instance of ``types``. Error response with body which could not be parsed,
+    e.g. HTML page of proxy, is classified by its status code
+    """
+    if isinstance(error, ResponseParseError) and error.status_code is not None:
+        return issubclass(errors_classes.get(error.status_code, HTTPError), types)
+
+    return isinstance(error, types)
@@ -0,0 +1,136 @@
+import asyncio
+import dataclasses
+import math
+import time
+from collections import deque
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+from typing import TypeVar
+
+from .errors import HTTPClientError
+from .retry import RetryBudget
+
+ResultType = TypeVar('ResultType')
+
+# Percentile is recalculated after this many new latency samples
+_RECALCULATE_EVERY = 16
+
+
+@dataclasses.dataclass
+class HedgeStats:
+    requests: int = 0
+    fired: int = 0
+    won: int = 0
+    # Hedges not fired because budget was exhausted
+    throttled: int = 0
+
+
+class HedgePolicy:
+    """
+    Sends duplicate of idempotent request if no response arrived within hedge delay, first successful
+    response wins and the other request is cancelled.
+
+    Delay is either static ``delay`` or ``percentile`` of last ``window`` observed latencies, hedging starts
+    once ``min_samples`` latencies are observed. Extra load is capped by ``budget``, by default hedges
+    may add at most 10% of requests made during last 10 seconds.
+    """
+
+    def __init__(
+            self,
+            *,
+            delay: Optional[float] = None,
+            percentile: float = 95.0,
+            window: int = 1000,
+            min_samples: int = 20,
+            min_delay: float = 0.005,
+            budget: RetryBudget = None,
+    ):
+        if not 0 < percentile < 100:
+            raise ValueError('percentile must be between 0 and 100')
+        if window < 1:
+            raise ValueError('window must be positive')
+
+        self.delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.budget = budget or RetryBudget(0.1, min_retries_per_second=0)
+        self.stats = HedgeStats()
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._percentile_delay: Optional[float] = None
+        self._samples_since_calculation = 0
+
+    def record_latency(self, seconds: float):
+        self._latencies.append(seconds)
+        self._samples_since_calculation += 1
+
+    def get_delay(self) -> Optional[float]:
+        """Returns delay before hedge is fired, or None if there is not enough data yet"""
+        if self.delay is not None:
+            return self.delay
+
+        if len(self._latencies) < self.min_samples:
+            return None
+
+        if self._percentile_delay is None or self._samples_since_calculation >= _RECALCULATE_EVERY:
+            latencies = sorted(self._latencies)
+            index = max(math.ceil(self.percentile / 100 * len(latencies)) - 1, 0)
+            self._percentile_delay = max(latencies[index], self.min_delay)
+            self._samples_since_calculation = 0
+
+        return self._percentile_delay
+
+    async def run(self, send: Callable[[], Awaitable[ResultType]]) -> ResultType:
+        self.stats.requests += 1
+        self.budget.record_request()
+        started_at = time.monotonic()
+        primary = asyncio.create_task(send())
+        tasks = {primary}
+
+        try:
+            delay = self.get_delay()
+
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+
+                if not primary.done():
+                    if self.budget.try_withdraw():
+                        self.stats.fired += 1
+                        tasks.add(asyncio.create_task(send()))
+                    else:
+                        self.stats.throttled += 1
+
+            pending = tasks
+            error = None
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    task_error = task.exception()
+
+                    if task_error is None:
+                        self.record_latency(time.monotonic() - started_at)
+
+                        if task is not primary:
+                            self.stats.won += 1
+
+                        return task.result()
+
+                    if isinstance(task_error, HTTPClientError):
+                        # Definite answer of server, duplicate would get the same
+                        raise task_error
+
+                    error = error or task_error
+
+            raise error
+        finally:
+            # Loser is cancelled and awaited, so its connection is released before returning
+            losers = [task for task in tasks if not task.done()]
+
+            for task in losers:
+                task.cancel()
+
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
@@ -0,0 +1,165 @@
+import abc
+import datetime
+import json
+import uuid
+from enum import Enum
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Union
+
+import ujson
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+Default = Optional[Callable[[Any], Any]]
+
+
+class JSONBackend(abc.ABC):
+    name: str
+    # Types serialized by backend itself exactly as jsonable_encoder would, `default` hook handles everything else
+    native_types: tuple[type, ...] = (str, int, float, bool, type(None), dict, list, tuple)
+    # Exceptions raised by `loads` on malformed input
+    decode_errors: tuple[type[Exception], ...] = (ValueError,)
+
+    @abc.abstractmethod
+    def loads(self, data: Union[str, bytes]) -> Any:
+        pass
+
+    @abc.abstractmethod
+    def dumps(self, obj: Any, *, default: Default = None) -> bytes:
+        pass
+
+    def is_native(self, obj: Any) -> bool:
+        """Whether obj consists of native types only, looking into dicts, lists and tuples"""
+        if isinstance(obj, dict):
+            return all(self.is_native(key) and self.is_native(value) for key, value in obj.items())
+
+        if isinstance(obj, (list, tuple)):
+            return all(self.is_native(item) for item in obj)
+
+        return isinstance(obj, self.native_types)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}()'
+
+
+class StdlibJSONBackend(JSONBackend):
+    name = 'json'
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any, *, default: Default = None) -> bytes:
+        return json.dumps(obj, default=default, separators=(',', ':')).encode()
+
+
+_stdlib_json_backend = StdlibJSONBackend()
+
+
+class UjsonBackend(JSONBackend):
+    name = 'ujson'
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return ujson.loads(data)
+
+    def dumps(self, obj: Any, *, default: Default = None) -> bytes:
+        if default is not None and not self.is_native(obj):
+            # ujson serializes Decimal by itself as float without calling default
+            obj = default(obj)
+
+        return ujson.dumps(obj, default=default).encode()
+
+
+class OrjsonBackend(JSONBackend):
+    name = 'orjson'
+    native_types = JSONBackend.native_types + (
+        datetime.datetime,
+        datetime.date,
+        datetime.time,
+        uuid.UUID,
+        Enum,
+    )
+
+    def __init__(self):
+        if orjson is None:
+            raise RuntimeError('orjson is not installed')
+
+        self.decode_errors = (orjson.JSONDecodeError,)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any, *, default: Default = None) -> bytes:
+        try:
+            return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # orjson does not support integers beyond 64 bits and times with timezone
+            return _stdlib_json_backend.dumps(obj, default=default)
+
+
+class MsgspecBackend(JSONBackend):
+    name = 'msgspec'
+    # bytes, timedelta, Decimal, datetime and time are serialized differently from jsonable_encoder, e.g. base64
+    # for bytes or Z suffix for UTC. Dates are left out too, as datetime is a subclass of date
+    native_types = JSONBackend.native_types + (
+        uuid.UUID,
+        Enum,
+    )
+
+    def __init__(self):
+        if msgspec is None:
+            raise RuntimeError('msgspec is not installed')
+
+        self.decode_errors = (msgspec.DecodeError, ValueError)
+        self._decoder = msgspec.json.Decoder()
+        # msgspec binds enc_hook to an encoder, so one encoder is kept per distinct hook
+        self._encoders: dict[Default, msgspec.json.Encoder] = {}
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._decoder.decode(data)
+
+    def dumps(self, obj: Any, *, default: Default = None) -> bytes:
+        if default is not None and not self.is_native(obj):
+            # msgspec never calls enc_hook for types it supports itself
+            obj = default(obj)
+
+        encoder = self._encoders.get(default)
+
+        if encoder is None:
+            encoder = self._encoders[default] = msgspec.json.Encoder(enc_hook=default, decimal_format='number')
+
+        return encoder.encode(obj)
+
+
+# Ordered from fastest to slowest
+_BACKENDS_PRIORITY: tuple[tuple[Any, type[JSONBackend]], ...] = (
+    (orjson, OrjsonBackend),
+    (msgspec, MsgspecBackend),
+    (ujson, UjsonBackend),
+)
+
+_default_json_backend: Optional[JSONBackend] = None
+
+
+def available_json_backends() -> list[JSONBackend]:
+    backends = [backend_class() for module, backend_class in _BACKENDS_PRIORITY if module is not None]
+    backends.append(StdlibJSONBackend())
+    return backends
+
+
+def get_default_json_backend() -> JSONBackend:
+    global _default_json_backend
+
+    if _default_json_backend is None:
+        _default_json_backend = available_json_backends()[0]
+
+    return _default_json_backend
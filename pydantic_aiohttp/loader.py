@@ -0,0 +1,194 @@
+import asyncio
+import operator
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Generic
+from typing import Iterable
+from typing import Optional
+from typing import Type
+from typing import TypeVar
+from typing import Union
+
+from .encoders import url_compatible_encoder
+from .timeouts import context_with_deadline
+from .types import Params
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .client import Client
+
+KeyType = TypeVar('KeyType')
+ItemType = TypeVar('ItemType')
+
+DEFAULT_MAX_BATCH_SIZE = 100
+
+
+class BatchLoader(Generic[KeyType, ItemType]):
+    """
+    Collects keys requested one by one and loads them with single request to bulk endpoint,
+    e.g. ``/items?ids=1,2,3`` instead of ``/items/1``, ``/items/2`` and ``/items/3``.
+
+    Keys requested during one event loop iteration (or within ``batch_window`` seconds) are sent together,
+    up to ``max_batch_size`` per request. Keys are joined with ``separator`` into single ``param`` value, or
+    sent as repeated parameter if ``separator`` is None. Response must be a list of items, each item is matched
+    to requested key by ``key`` attribute name or callable. Keys missing in response are loaded as None.
+
+    Loaded items are cached by key unless ``cache=False``, failed keys are not cached.
+    """
+
+    def __init__(
+            self,
+            client: 'Client',
+            path: str,
+            response_model: Type[ItemType],
+            *,
+            key: Union[str, Callable[[ItemType], KeyType]] = 'id',
+            param: str = 'ids',
+            separator: Optional[str] = ',',
+            params: Params = None,
+            max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+            batch_window: float = 0.0,
+            cache: bool = True,
+            **request_kwargs
+    ):
+        if max_batch_size < 1:
+            raise ValueError('max_batch_size must be positive')
+
+        self._client = client
+        self._path = path
+        self._bulk_model = list[response_model]
+        self._key = operator.attrgetter(key) if isinstance(key, str) else key
+        self._param = param
+        self._separator = separator
+        self._params = params
+        self._max_batch_size = max_batch_size
+        self._batch_window = batch_window
+        self._cache_enabled = cache
+        self._request_kwargs = request_kwargs
+        # Futures by encoded key
+        self._cache: dict[str, asyncio.Future] = {}
+        self._batch: dict[str, asyncio.Future] = {}
+        self._dispatch_handle: Optional[asyncio.Handle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def _encode_key(key: Any) -> str:
+        return url_compatible_encoder(key)
+
+    async def load(self, key: KeyType) -> Optional[ItemType]:
+        encoded_key = self._encode_key(key)
+        future = self._cache.get(encoded_key) or self._batch.get(encoded_key)
+
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._batch[encoded_key] = future
+
+            if self._cache_enabled:
+                self._cache[encoded_key] = future
+
+            self._schedule_dispatch()
+
+        # Cancelling one caller must not cancel the load shared with others
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[KeyType]) -> list[Optional[ItemType]]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: KeyType, item: ItemType):
+        """Puts already known item to cache"""
+        if not self._cache_enabled:
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(item)
+        self._cache[self._encode_key(key)] = future
+
+    def clear(self, key: KeyType = None):
+        """Drops ``key`` or all keys from cache"""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(self._encode_key(key), None)
+
+    def _schedule_dispatch(self):
+        if len(self._batch) >= self._max_batch_size:
+            self._dispatch()
+            return
+
+        if self._dispatch_handle is not None:
+            return
+
+        loop = asyncio.get_running_loop()
+
+        if self._batch_window > 0:
+            self._dispatch_handle = loop.call_later(self._batch_window, self._dispatch)
+        else:
+            self._dispatch_handle = loop.call_soon(self._dispatch)
+
+    def _dispatch(self):
+        if self._dispatch_handle is not None:
+            self._dispatch_handle.cancel()
+            self._dispatch_handle = None
+
+        batch, self._batch = self._batch, {}
+
+        if not batch:
+            return
+
+        # Batch is shared by callers, so it is not bound by deadline of whichever of them scheduled it
+        task = context_with_deadline(None).run(asyncio.create_task, self._load_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _load_batch(self, batch: dict[str, asyncio.Future]):
+        keys = list(batch)
+
+        try:
+            items = await self._client.get(
+                self._path,
+                params={
+                    **(self._params or {}),
+                    self._param: keys if self._separator is None else self._separator.join(keys)
+                },
+                response_model=self._bulk_model,
+                **self._request_kwargs
+            )
+        except asyncio.CancelledError as e:
+            self._fail(batch, e)
+            raise
+        except Exception as e:
+            self._fail(batch, e)
+            return
+
+        items_by_key = {self._encode_key(self._key(item)): item for item in items or ()}
+
+        for encoded_key, future in batch.items():
+            if not future.done():
+                future.set_result(items_by_key.get(encoded_key))
+
+    def _fail(self, batch: dict[str, asyncio.Future], error: BaseException):
+        for encoded_key, future in batch.items():
+            if self._cache.get(encoded_key) is future:
+                del self._cache[encoded_key]
+
+            if future.done():
+                continue
+
+            if isinstance(error, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(error)
+
+    async def close(self):
+        """Cancels pending and running loads"""
+        if self._dispatch_handle is not None:
+            self._dispatch_handle.cancel()
+            self._dispatch_handle = None
+
+        batch, self._batch = self._batch, {}
+        self._fail(batch, asyncio.CancelledError())
+
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
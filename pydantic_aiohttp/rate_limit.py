@@ -0,0 +1,167 @@
+import asyncio
+import re
+import time
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Union
+
+from yarl import URL
+
+from .retry import parse_retry_after
+
+# X-RateLimit-Reset values above this are treated as unix timestamps, below as seconds
+_EPOCH_THRESHOLD = 10 ** 9
+
+
+class RateLimit(NamedTuple):
+    # Requests per second
+    rate: float
+    # Requests allowed in a burst
+    burst: int = 1
+
+
+class TokenBucket:
+    """
+    Async token bucket. Waiters queue on a FIFO lock and sleep exactly until next token is available,
+    so they are served in arrival order without polling.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        if burst < 1:
+            raise ValueError('burst must be at least 1')
+
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        if now <= self._updated_at:
+            # Bucket is paused
+            return
+
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Blocks bucket for ``seconds``, e.g. after upstream reported exhausted quota"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+        self._updated_at = self._paused_until
+
+    def limit_tokens(self, remaining: int):
+        """Never allows more requests than upstream reported as remaining in its window"""
+        self._refill(time.monotonic())
+        self._tokens = min(self._tokens, float(remaining))
+
+
+def _parse_reset(value: str) -> Optional[float]:
+    try:
+        reset = float(value)
+    except ValueError:
+        return None
+
+    if reset > _EPOCH_THRESHOLD:
+        reset -= time.time()
+
+    return max(reset, 0.0)
+
+
+class RateLimiter:
+    """
+    Client side rate limiter.
+
+    Requests whose URL path matches one of ``routes`` regular expressions share the bucket of that route,
+    other requests use per host bucket with ``default`` limit, or are not limited if ``default`` is None.
+    Buckets adapt to ``Retry-After`` and ``X-RateLimit-Remaining``/``X-RateLimit-Reset`` response headers.
+    """
+
+    def __init__(
+            self,
+            default: RateLimit = None,
+            *,
+            routes: Mapping[Union[str, re.Pattern], RateLimit] = None,
+    ):
+        self._default = default
+        self._routes = [(re.compile(pattern), limit) for pattern, limit in (routes or {}).items()]
+        self._buckets: dict[tuple, TokenBucket] = {}
+
+    def bucket_for(self, url: URL) -> Optional[TokenBucket]:
+        key = limit = None
+
+        for pattern, route_limit in self._routes:
+            if pattern.search(url.path):
+                key, limit = ('route', url.host, pattern.pattern), route_limit
+                break
+        else:
+            if self._default is not None:
+                key, limit = ('host', url.host), self._default
+
+        if key is None:
+            return None
+
+        bucket = self._buckets.get(key)
+
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(limit.rate, limit.burst)
+
+        return bucket
+
+    async def acquire(self, url: URL):
+        bucket = self.bucket_for(url)
+
+        if bucket is not None:
+            await bucket.acquire()
+
+    def update(self, url: URL, headers: Mapping[str, str]):
+        bucket = self.bucket_for(url)
+
+        if bucket is None:
+            return
+
+        retry_after = parse_retry_after(headers)
+
+        if retry_after is not None:
+            bucket.pause(retry_after)
+            return
+
+        remaining = headers.get('X-RateLimit-Remaining')
+
+        if remaining is None:
+            return
+
+        try:
+            remaining = int(remaining)
+        except ValueError:
+            return
+
+        if remaining > 0:
+            bucket.limit_tokens(remaining)
+            return
+
+        reset = _parse_reset(headers.get('X-RateLimit-Reset', ''))
+
+        if reset:
+            bucket.pause(reset)
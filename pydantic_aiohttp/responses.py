@@ -1,31 +1,60 @@
 import abc
+import http
 import logging
+from typing import Any
 from typing import Generic
 from typing import Optional
 from typing import Type
 from typing import TypeVar
 from typing import Union
 
-import aiofiles
 import aiohttp.web_response
-import pydantic
-import ujson
 from aiohttp.typedefs import PathLike
 
+from .adapters import get_type_adapter
+from .checkpoint import DownloadCheckpoint
+from .checkpoint import content_validator
+from .errors import RangeNotSupportedError
+from .json_backends import JSONBackend
+from .json_backends import get_default_json_backend
+from .sinks import FileSink
+from .sinks import Sink
 from .types import EmptyResponse
 from .utils import DEFAULT_DOWNLOAD_CHUNK_SIZE
+from .utils import DEFAULT_WRITE_BATCH_SIZE
 
 ResponseContentType = TypeVar('ResponseContentType')
 
 
 class ResponseClass(abc.ABC, Generic[ResponseContentType]):
     charset: str = "utf-8"
+    # Whether response is fully read into memory, so it could be cached. Cacheable classes implement
+    # parse_body(body, *args, **kwargs) which parses the value again from raw body of cached response
+    cacheable: bool = False
     aiohttp_response: aiohttp.ClientResponse
 
-    def __init__(self, aiohttp_response: aiohttp.ClientResponse):
+    def __init__(self, aiohttp_response: Optional[aiohttp.ClientResponse], *, json_backend: JSONBackend = None):
         self.aiohttp_response = aiohttp_response
+        self.json_backend = json_backend or get_default_json_backend()
         self.logger = logging.getLogger(self.__class__.__name__)
 
+    def prepare_body(self, body: bytes) -> Union[str, bytes]:
+        body = body.strip()
+
+        if self.charset.lower().replace('-', '') != 'utf8':
+            return body.decode(self.charset)
+
+        return body
+
+    def decode_json(self, body: bytes) -> Any:
+        body = self.prepare_body(body)
+
+        if not body:
+            # Same as aiohttp_response.json() behaviour for empty body
+            return None
+
+        return self.json_backend.loads(body)
+
     async def parse(self, *args, **kwargs) -> Optional[ResponseContentType]:
         return self.aiohttp_response.content
 
@@ -36,13 +65,18 @@ class RawResponseClass(ResponseClass[aiohttp.ClientResponse]):
 
 
 class NoneResponseClass(ResponseClass[None]):
-    async def parse(self) -> None:
+    async def parse(self, *args, **kwargs) -> None:
         return None
 
 
 class PlainTextResponseClass(ResponseClass[str]):
+    cacheable = True
+
+    def parse_body(self, body: bytes, *args, **kwargs) -> str:
+        return body.decode(self.charset)
+
     async def parse(self, *args, **kwargs) -> str:
-        return await self.aiohttp_response.text(self.charset)
+        return self.parse_body(await self.aiohttp_response.read())
 
 
 _JsonBaseFields = Union[str, int, float, bool, None]
@@ -50,42 +84,144 @@ Json = Union[_JsonBaseFields, dict[str, _JsonBaseFields], list[_JsonBaseFields]]
 
 
 class JSONResponseClass(ResponseClass[Json]):
+    cacheable = True
+
+    def parse_body(self, body: bytes, *args, **kwargs) -> Optional[Json]:
+        return self.decode_json(body)
+
     async def parse(self, *args, **kwargs) -> Optional[Json]:
-        return await self.aiohttp_response.json(
-            encoding=self.charset,
-            loads=ujson.loads,
-            content_type=None
-        )
+        return self.parse_body(await self.aiohttp_response.read())
 
 
 PydanticModel = TypeVar('PydanticModel')
 
+# Response models which do not benefit from pydantic validation, plain decoding is enough for them
+_PLAIN_JSON_MODELS = (dict, list, Json)
+
 
 class PydanticModelResponseClass(ResponseClass[PydanticModel]):
+    cacheable = True
+    # When enabled, raw response bytes are validated by pydantic-core in a single pass
+    # instead of being decoded into python objects first and validated afterwards
+    validate_json: bool = True
+
+    def parse_body(self, body: bytes, *args, response_model: Type[PydanticModel], **kwargs) -> PydanticModel:
+        if response_model is None:
+            return EmptyResponse()
+
+        adapter = get_type_adapter(response_model)
+
+        if not self.validate_json or response_model in _PLAIN_JSON_MODELS:
+            return adapter.validate_python(self.decode_json(body))
+
+        body = self.prepare_body(body)
+
+        if not body:
+            # Same as aiohttp_response.json() behaviour for empty body
+            return adapter.validate_python(None)
+
+        return adapter.validate_json(body)
+
     async def parse(self, *args, response_model: Type[PydanticModel], **kwargs) -> PydanticModel:
         if response_model is None:
             return EmptyResponse()
             # raise ValueError('response_model could not be None. If you need bare dict use JSONResponseClass instead')
 
-        response_json = await self.aiohttp_response.json(
-            encoding=self.charset,
-            loads=ujson.loads,
-            content_type=None
-        )
+        return self.parse_body(await self.aiohttp_response.read(), response_model=response_model)
 
-        return pydantic.parse_obj_as(response_model, response_json)
 
+class StreamResponseClass(ResponseClass[Any]):
+    """
+    Streams body into ``sink`` and returns its result, or into file at ``filepath`` without sink.
+    With ``offset`` response must be a byte range, which is written into already allocated file at ``offset``
+    """
+
+    async def _write_chunks(self, sink: Sink, chunk_size: int):
+        async for chunk in self.aiohttp_response.content.iter_chunked(chunk_size):
+            await sink.write(chunk)
+
+    async def parse(
+            self,
+            *args,
+            filepath: PathLike = None,
+            sink: Sink = None,
+            chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+            offset: Optional[int] = None,
+            write_batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+            **kwargs
+    ) -> Any:
+        if offset is not None and self.aiohttp_response.status != http.HTTPStatus.PARTIAL_CONTENT:
+            # Whole content written at offset would corrupt the file
+            raise RangeNotSupportedError(f'expected range starting at {offset}, got {self.aiohttp_response.status}')
+
+        if sink is None:
+            if filepath is None:
+                raise ValueError('filepath or sink must be set')
+
+            sink = FileSink(filepath, offset=offset, batch_size=write_batch_size)
+
+        await sink.open(self.aiohttp_response)
+
+        try:
+            await self._write_chunks(sink, chunk_size)
+        except BaseException:
+            await sink.abort()
+            raise
+
+        await sink.close()
+        return sink.result()
+
+
+def _content_range_start(value: Optional[str]) -> Optional[int]:
+    # bytes 100-199/1000
+    try:
+        unit, byte_range = value.split(' ', 1)
+        return int(byte_range.split('-', 1)[0]) if unit == 'bytes' else None
+    except (AttributeError, ValueError):
+        return None
+
+
+class ResumableStreamResponseClass(StreamResponseClass):
+    """
+    Continues partially downloaded file from ``resume_from`` if server sent requested range,
+    or writes it from scratch if server sent whole content, e.g. because it has changed since checkpoint.
+    Checkpoint sidecar is kept until file is complete
+    """
 
-class StreamResponseClass(ResponseClass[PathLike]):
     async def parse(
             self,
             *args,
             filepath: PathLike,
             chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE,
+            resume_from: int = 0,
+            checkpoint: DownloadCheckpoint,
+            write_batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
             **kwargs
     ) -> PathLike:
-        async with aiofiles.open(filepath, 'wb') as fd:
-            async for chunk in self.aiohttp_response.content.iter_chunked(chunk_size):
-                await fd.write(chunk)
+        position = 0
+
+        if resume_from and self.aiohttp_response.status == http.HTTPStatus.PARTIAL_CONTENT:
+            position = _content_range_start(self.aiohttp_response.headers.get('Content-Range'))
+
+            if position != resume_from:
+                raise RangeNotSupportedError(f'expected range starting at {resume_from}, got {position}')
+
+        checkpoint_path = DownloadCheckpoint.path_for(filepath)
+
+        if position == 0:
+            checkpoint.validator = content_validator(self.aiohttp_response.headers)
+            checkpoint.size = self.aiohttp_response.content_length
+            await checkpoint.save(checkpoint_path)
+
+        # File is not preallocated, its size tells where to resume from
+        sink = FileSink(filepath, offset=position or None, batch_size=write_batch_size, preallocate=False)
+        await sink.open(self.aiohttp_response)
+
+        try:
+            await self._write_chunks(sink, chunk_size)
+        finally:
+            # Data received before failure is kept to resume from
+            await sink.close()
 
+        await DownloadCheckpoint.remove(checkpoint_path)
         return filepath
@@ -0,0 +1,160 @@
+import email.utils
+import random
+import threading
+import time
+from collections import deque
+from typing import Mapping
+from typing import Optional
+from typing import Type
+
+import aiohttp
+
+from .errors import HTTPBadGateway
+from .errors import HTTPGatewayTimeout
+from .errors import HTTPServiceUnavailable
+from .errors import HTTPTooManyRequests
+from .errors import matches_error
+
+DEFAULT_RETRY_ON: tuple[Type[Exception], ...] = (
+    HTTPServiceUnavailable,
+    HTTPTooManyRequests,
+    HTTPGatewayTimeout,
+    HTTPBadGateway,
+    aiohttp.ClientConnectionError,
+    # Connection dropped in the middle of response body
+    aiohttp.ClientPayloadError,
+)
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'TRACE', 'PUT', 'DELETE'})
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Returns delay in seconds from ``Retry-After`` header given either as seconds or as HTTP-date"""
+    if not headers:
+        return None
+
+    value = headers.get('Retry-After')
+
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class RetryBudget:
+    """
+    Limits retries to ``ratio`` of requests made during last ``ttl`` seconds, plus ``min_retries_per_second``
+    so low traffic clients can still retry. Prevents retry storms from multiplying load during incidents.
+    """
+
+    def __init__(self, ratio: float = 0.1, *, min_retries_per_second: float = 10, ttl: int = 10):
+        if ratio < 0:
+            raise ValueError('ratio must not be negative')
+        if ttl < 1:
+            raise ValueError('ttl must be at least 1 second')
+
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.ttl = ttl
+        # [second, requests, retries] per second of the window
+        self._buckets: deque[list[int]] = deque()
+        self._lock = threading.Lock()
+
+    def _current_bucket(self) -> list[int]:
+        now = int(time.monotonic())
+
+        while self._buckets and self._buckets[0][0] <= now - self.ttl:
+            self._buckets.popleft()
+
+        if not self._buckets or self._buckets[-1][0] != now:
+            self._buckets.append([now, 0, 0])
+
+        return self._buckets[-1]
+
+    def record_request(self):
+        with self._lock:
+            self._current_bucket()[1] += 1
+
+    def try_withdraw(self) -> bool:
+        with self._lock:
+            bucket = self._current_bucket()
+            requests = sum(b[1] for b in self._buckets)
+            retries = sum(b[2] for b in self._buckets)
+
+            if retries + 1 > self.min_retries_per_second * self.ttl + self.ratio * requests:
+                return False
+
+            bucket[2] += 1
+            return True
+
+
+class RetryPolicy:
+    """
+    Decides whether failed request should be retried and how long to wait before next attempt.
+
+    Delay is capped exponential backoff ``min(backoff_max, backoff_base * 2 ** retry)`` with full jitter.
+    ``Retry-After`` header of HTTP errors is honoured up to ``max_retry_after`` seconds, longer delays are not
+    retried at all. Non-idempotent methods are retried only with ``retry_non_idempotent=True``, except when
+    connection could not be established and request was never sent.
+    """
+
+    def __init__(
+            self,
+            *,
+            attempts: int = 3,
+            retry_on: tuple[Type[Exception], ...] = DEFAULT_RETRY_ON,
+            backoff_base: float = 0.1,
+            backoff_max: float = 10.0,
+            jitter: bool = True,
+            retry_non_idempotent: bool = False,
+            respect_retry_after: bool = True,
+            max_retry_after: float = 60.0,
+    ):
+        if attempts < 1:
+            raise ValueError('attempts must be at least 1')
+
+        self.attempts = attempts
+        self.retry_on = retry_on
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_non_idempotent = retry_non_idempotent
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    def is_retryable(self, method: str, error: Exception) -> bool:
+        if not matches_error(error, self.retry_on):
+            return False
+
+        if method.upper() in IDEMPOTENT_METHODS or self.retry_non_idempotent:
+            return True
+
+        # Request never reached server
+        return isinstance(error, aiohttp.ClientConnectorError)
+
+    def get_delay(self, retry: int, error: Exception) -> Optional[float]:
+        """Returns delay before retry number ``retry`` (starting from 0) or None if request must not be retried"""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** retry)
+
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        if self.respect_retry_after:
+            retry_after = parse_retry_after(getattr(error, 'headers', None))
+
+            if retry_after is not None:
+                if retry_after > self.max_retry_after:
+                    return None
+
+                delay = max(delay, retry_after)
+
+        return delay
@@ -0,0 +1,169 @@
+import asyncio
+import contextlib
+import enum
+import heapq
+import itertools
+import math
+from typing import Iterator
+from typing import Mapping
+from typing import Optional
+
+
+class Priority(enum.IntEnum):
+    """Predefined priority classes, lower value is served first. Any int may be used as priority"""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class _PriorityClass:
+    __slots__ = ('reserved', 'weight', 'in_flight', 'served', 'waiters')
+
+    def __init__(self, reserved: int, weight: float):
+        self.reserved = reserved
+        self.weight = weight
+        self.in_flight = 0
+        self.served = 0
+        # (deadline, sequence, future) heap
+        self.waiters: list[tuple[float, int, asyncio.Future]] = []
+
+    @property
+    def unused_reservation(self) -> int:
+        return max(self.reserved - self.in_flight, 0)
+
+
+class PriorityScheduler:
+    """
+    Shares ``max_in_flight`` request slots (usually equal to connection limit of ``Client``) between
+    priority classes.
+
+    Waiting requests are served by priority, then by deadline, then in arrival order. With ``weights``
+    classes are served in proportion to their weights instead of strict priority, so low priority
+    requests are slowed down but never starved. ``reserved`` slots of a class are never taken by other
+    classes, even when the class does not use them.
+    """
+
+    def __init__(
+            self,
+            max_in_flight: int = 100,
+            *,
+            reserved: Mapping[int, int] = None,
+            weights: Mapping[int, float] = None,
+    ):
+        reserved = reserved or {}
+
+        if max_in_flight < 1:
+            raise ValueError('max_in_flight must be positive')
+        if sum(reserved.values()) > max_in_flight:
+            raise ValueError('reserved slots must not exceed max_in_flight')
+
+        self.max_in_flight = max_in_flight
+        self._reserved = dict(reserved)
+        self._weights = dict(weights) if weights is not None else None
+        self._classes: dict[int, _PriorityClass] = {}
+        self._in_flight = 0
+        self._sequence = itertools.count()
+
+        for priority in {*self._reserved, *(self._weights or {})}:
+            self._class(priority)
+
+    def _class(self, priority: int) -> _PriorityClass:
+        priority_class = self._classes.get(priority)
+
+        if priority_class is None:
+            weight = 1.0 if self._weights is None else self._weights.get(priority, 1.0)
+            priority_class = self._classes[priority] = _PriorityClass(self._reserved.get(priority, 0), weight)
+
+        return priority_class
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(priority_class.waiters) for priority_class in self._classes.values())
+
+    def _can_start(self, priority_class: _PriorityClass) -> bool:
+        if self._in_flight >= self.max_in_flight:
+            return False
+
+        if priority_class.in_flight < priority_class.reserved:
+            return True
+
+        reserved_by_others = sum(c.unused_reservation for c in self._classes.values())
+        return self._in_flight + reserved_by_others < self.max_in_flight
+
+    def _start(self, priority_class: _PriorityClass):
+        priority_class.in_flight += 1
+        priority_class.served += 1
+        self._in_flight += 1
+
+    def _serving_order(self) -> list[_PriorityClass]:
+        if self._weights is None:
+            return [self._classes[priority] for priority in sorted(self._classes)]
+
+        # Weighted fair queueing: class which got least service relative to its weight goes first
+        return sorted(self._classes.values(), key=lambda c: c.served / c.weight)
+
+    def _catch_up(self, priority_class: _PriorityClass):
+        # Class returning after idle period must not monopolize slots for service it did not use
+        active = [c.served / c.weight for c in self._classes.values() if c.waiters]
+
+        if active:
+            priority_class.served = max(priority_class.served, min(active) * priority_class.weight)
+
+    def _dispatch(self):
+        while self._in_flight < self.max_in_flight:
+            for priority_class in self._serving_order():
+                waiters = priority_class.waiters
+
+                while waiters and waiters[0][2].done():
+                    # Cancelled or timed out waiter
+                    heapq.heappop(waiters)
+
+                if waiters and self._can_start(priority_class):
+                    _, _, waiter = heapq.heappop(waiters)
+                    self._start(priority_class)
+                    waiter.set_result(None)
+                    break
+            else:
+                return
+
+    async def acquire(self, priority: int = Priority.NORMAL, deadline: Optional[float] = None):
+        """Waits for slot, ``deadline`` is a ``time.monotonic()`` value used to order requests of one class"""
+        priority_class = self._class(priority)
+
+        if not priority_class.waiters and self._can_start(priority_class):
+            self._start(priority_class)
+            return
+
+        if self._weights is not None and not priority_class.waiters:
+            self._catch_up(priority_class)
+
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (math.inf if deadline is None else deadline, next(self._sequence), waiter)
+        heapq.heappush(priority_class.waiters, entry)
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was granted right before cancellation
+                self.release(priority)
+
+            raise
+
+    def release(self, priority: int = Priority.NORMAL):
+        self._classes[priority].in_flight -= 1
+        self._in_flight -= 1
+        self._dispatch()
+
+    @contextlib.contextmanager
+    def track(self, priority: int = Priority.NORMAL) -> Iterator['PriorityScheduler']:
+        """Releases slot taken by ``acquire`` when request is done"""
+        try:
+            yield self
+        finally:
+            self.release(priority)
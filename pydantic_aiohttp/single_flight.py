@@ -0,0 +1,67 @@
+import asyncio
+import contextvars
+from typing import Awaitable
+from typing import Callable
+from typing import Hashable
+from typing import Optional
+from typing import TypeVar
+
+ResultType = TypeVar('ResultType')
+
+# Only requests without side effects may be shared between callers
+COALESCED_METHODS = frozenset({'GET', 'HEAD'})
+
+
+class _Flight:
+    __slots__ = ('task', 'waiters')
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time, concurrent callers with the same key await the call already
+    in flight and get the same result or exception.
+
+    Cancelling one caller does not affect the others, the call itself is cancelled only when every
+    caller waiting for it is cancelled.
+    """
+
+    def __init__(self):
+        self._flights: dict[Hashable, _Flight] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def _forget(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def do(
+            self,
+            key: Hashable,
+            call: Callable[[], Awaitable[ResultType]],
+            *,
+            context: Optional[contextvars.Context] = None,
+    ) -> ResultType:
+        """Call is run in ``context`` if given, otherwise in copy of context of the caller who started it"""
+        flight = self._flights.get(key)
+
+        if flight is None:
+            context = context or contextvars.copy_context()
+            flight = self._flights[key] = _Flight(context.run(asyncio.ensure_future, call()))
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+
+        flight.waiters += 1
+
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+
+            if flight.waiters == 0 and not flight.task.done():
+                # Last caller was cancelled, nobody needs the result anymore
+                self._forget(key, flight)
+                flight.task.cancel()
@@ -0,0 +1,342 @@
+import abc
+import asyncio
+import base64
+import hashlib
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Mapping
+from typing import Optional
+from typing import Union
+
+import aiohttp
+from aiohttp.typedefs import PathLike
+
+from .errors import ChecksumMismatchError
+from .utils import DEFAULT_WRITE_BATCH_SIZE
+
+# Batches handed to writer thread but not written yet, bounds memory to about (1 + this) batches
+DEFAULT_MAX_PENDING_WRITES = 2
+# Algorithm names of Digest and Repr-Digest headers mapped to hashlib names
+DIGEST_ALGORITHMS = {
+    'md5': 'md5',
+    'sha': 'sha1',
+    'sha-256': 'sha256',
+    'sha-512': 'sha512',
+}
+_HAS_PWRITE = hasattr(os, 'pwrite')
+_O_BINARY = getattr(os, 'O_BINARY', 0)
+
+
+def _is_identity_encoded(response: aiohttp.ClientResponse) -> bool:
+    return response.headers.get('Content-Encoding', 'identity').lower() == 'identity'
+
+
+def _decoded_size(response: Optional[aiohttp.ClientResponse]) -> Optional[int]:
+    if response is None or not _is_identity_encoded(response):
+        # Size of decoded body is known only for identity encoding
+        return None
+
+    return response.content_length
+
+
+def header_digests(headers: Mapping[str, str]) -> dict[str, str]:
+    """Returns hex digests of content from Content-MD5, Digest and Repr-Digest headers by hashlib name"""
+    digests = {}
+    values = [f'md5={headers["Content-MD5"]}'] if 'Content-MD5' in headers else []
+
+    for header in ('Digest', 'Repr-Digest'):
+        values.extend(headers.get(header, '').split(','))
+
+    for value in values:
+        algorithm, _, encoded = value.strip().partition('=')
+        name = DIGEST_ALGORITHMS.get(algorithm.lower())
+
+        if name is None or not encoded:
+            continue
+
+        try:
+            # Repr-Digest wraps value in colons
+            digests[name] = base64.b64decode(encoded.strip(':'), validate=True).hex()
+        except ValueError:
+            continue
+
+    return digests
+
+
+class Sink(abc.ABC):
+    """
+    Receives streamed response body chunk by chunk, see ``StreamResponseClass``.
+    Sink is opened again for every retry of request
+    """
+
+    async def open(self, response: Optional[aiohttp.ClientResponse] = None):
+        """Called with response before first chunk"""
+
+    @abc.abstractmethod
+    async def write(self, chunk: bytes):
+        ...
+
+    async def close(self):
+        """Called after last chunk"""
+
+    async def abort(self):
+        """Called instead of ``close`` when streaming failed"""
+
+    def result(self) -> Any:
+        """Value returned by ``StreamResponseClass.parse``"""
+        return None
+
+    async def __aenter__(self) -> 'Sink':
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.close()
+        else:
+            await self.abort()
+
+
+def _write_all(fd: int, data: bytes, position: int):
+    view = memoryview(data)
+
+    while view:
+        if _HAS_PWRITE:
+            written = os.pwrite(fd, view, position)
+        else:
+            # Only writer thread touches descriptor, so seek and write are not interleaved
+            os.lseek(fd, position, os.SEEK_SET)
+            written = os.write(fd, view)
+
+        view = view[written:]
+        position += written
+
+
+class FileSink(Sink):
+    """
+    Writes downloaded chunks to file at ``offset`` (whole file is truncated if it is None).
+
+    Chunks are coalesced into batches of ``batch_size`` bytes written by dedicated thread with ``os.pwrite``,
+    so there is one thread handoff per batch instead of one per chunk, and disk writes overlap with network
+    reads. At most ``max_pending_writes`` batches wait for writer thread, after that ``write`` waits for disk.
+    File is preallocated up front to ``size`` or to size of response, unless ``preallocate`` is False
+    """
+
+    def __init__(
+            self,
+            filepath: PathLike,
+            *,
+            offset: Optional[int] = None,
+            size: Optional[int] = None,
+            batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+            max_pending_writes: int = DEFAULT_MAX_PENDING_WRITES,
+            preallocate: bool = True,
+    ):
+        if batch_size < 1 or max_pending_writes < 1:
+            raise ValueError('batch_size and max_pending_writes must be positive')
+
+        self.filepath = filepath
+        self.offset = offset
+        self.size = size
+        self.batch_size = batch_size
+        self.max_pending_writes = max_pending_writes
+        self.preallocate = preallocate
+        self._fd: Optional[int] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._position = offset or 0
+        self._batch: list[bytes] = []
+        self._batch_size = 0
+        self._pending: deque[asyncio.Future] = deque()
+
+    def _run(self, func, *args) -> asyncio.Future:
+        return asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _open(self) -> int:
+        if self.offset is None:
+            fd = os.open(self.filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_BINARY, 0o666)
+
+            if self.size and self.preallocate:
+                os.ftruncate(fd, self.size)
+
+            return fd
+
+        return os.open(self.filepath, os.O_WRONLY | _O_BINARY)
+
+    async def open(self, response: Optional[aiohttp.ClientResponse] = None):
+        if self.size is None and self.offset is None:
+            self.size = _decoded_size(response)
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pydantic_aiohttp_writer')
+
+        try:
+            self._fd = await self._run(self._open)
+        except BaseException:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            raise
+
+    async def _submit(self):
+        data = self._batch[0] if len(self._batch) == 1 else b''.join(self._batch)
+        self._pending.append(self._run(_write_all, self._fd, data, self._position))
+        self._position += self._batch_size
+        self._batch = []
+        self._batch_size = 0
+
+        while len(self._pending) > self.max_pending_writes:
+            await self._pending.popleft()
+
+    async def write(self, chunk: bytes):
+        self._batch.append(chunk)
+        self._batch_size += len(chunk)
+
+        if self._batch_size >= self.batch_size:
+            await self._submit()
+
+    async def _drain(self):
+        while self._pending:
+            await self._pending.popleft()
+
+    async def close(self):
+        """Writes rest of data and closes file"""
+        try:
+            if self._batch:
+                await self._submit()
+
+            await self._drain()
+        finally:
+            await self.abort()
+
+    async def abort(self):
+        """Closes file without writing rest of data"""
+        if self._fd is None:
+            return
+
+        self._batch = []
+        # Writer thread runs jobs in order, so descriptor is closed after all submitted writes
+        closed = self._run(os.close, self._fd)
+
+        try:
+            # Errors of pending writes are retrieved and dropped, as rest of data is dropped anyway
+            await asyncio.gather(*self._pending, return_exceptions=True)
+            await closed
+        finally:
+            self._pending.clear()
+            self._fd = None
+            self._executor.shutdown(wait=False)
+
+    def result(self) -> PathLike:
+        return self.filepath
+
+
+class MemorySink(Sink):
+    """
+    Collects body into ``buffer`` (bytearray or writable memoryview) without intermediate bytes objects.
+    Without ``buffer`` bytearray of response size is allocated, growing in place if size is unknown.
+    Result is memoryview of received part of buffer
+    """
+
+    def __init__(self, buffer: Union[bytearray, memoryview, None] = None):
+        self.buffer = buffer
+        self._fixed = buffer is not None
+        self._position = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._position
+
+    async def open(self, response: Optional[aiohttp.ClientResponse] = None):
+        if self.buffer is None:
+            self.buffer = bytearray(_decoded_size(response) or 0)
+
+        self._position = 0
+
+    async def write(self, chunk: bytes):
+        end = self._position + len(chunk)
+
+        if self._fixed and end > len(self.buffer):
+            raise ValueError(f'response body does not fit into buffer of {len(self.buffer)} bytes')
+
+        self.buffer[self._position:end] = chunk
+        self._position = end
+
+    def result(self) -> memoryview:
+        return memoryview(self.buffer)[:self._position]
+
+
+class HashingSink(Sink):
+    """
+    Computes digest of body while passing it to ``sink``, if any. On close digest is checked against
+    ``expected`` hex digest or, with ``verify_headers``, against Content-MD5, Digest or Repr-Digest headers of
+    response, and ``ChecksumMismatchError`` is raised if it does not match.
+    Result is result of ``sink`` or hex digest without it
+    """
+
+    def __init__(
+            self,
+            sink: Optional[Sink] = None,
+            *,
+            algorithm: str = 'sha256',
+            expected: Optional[str] = None,
+            verify_headers: bool = True,
+    ):
+        self.sink = sink
+        self.expected = expected
+        self.verify_headers = verify_headers
+        self.hash = hashlib.new(algorithm)
+        self._expected = expected
+
+    async def open(self, response: Optional[aiohttp.ClientResponse] = None):
+        # Sink is opened again when request is retried
+        self.hash = hashlib.new(self.hash.name)
+        self._expected = self.expected
+
+        if (
+                self._expected is None
+                and self.verify_headers
+                and response is not None
+                and response.status == 200
+                and _is_identity_encoded(response)
+        ):
+            # Headers describe whole representation as sent, i.e. neither ranges nor compressed content
+            self._expected = header_digests(response.headers).get(self.hash.name)
+
+        if self.sink is not None:
+            await self.sink.open(response)
+
+    async def write(self, chunk: bytes):
+        self.hash.update(chunk)
+
+        if self.sink is not None:
+            await self.sink.write(chunk)
+
+    def hexdigest(self) -> str:
+        return self.hash.hexdigest()
+
+    async def close(self):
+        if self.sink is not None:
+            await self.sink.close()
+
+        if self._expected is not None and self._expected.lower() != self.hexdigest():
+            raise ChecksumMismatchError(self.hash.name, self._expected.lower(), self.hexdigest())
+
+    async def abort(self):
+        if self.sink is not None:
+            await self.sink.abort()
+
+    def result(self) -> Any:
+        return self.sink.result() if self.sink is not None else self.hexdigest()
+
+
+class CallbackSink(Sink):
+    """Passes every chunk to ``callback`` coroutine, e.g. to forward it to another service"""
+
+    def __init__(self, callback: Callable[[bytes], Awaitable[Any]]):
+        self.callback = callback
+
+    async def write(self, chunk: bytes):
+        # Next chunk is not read until callback is done, so slow consumer slows down download
+        await self.callback(chunk)
@@ -0,0 +1,130 @@
+import asyncio
+import contextlib
+import contextvars
+import dataclasses
+import functools
+import time
+from contextvars import ContextVar
+from typing import Iterator
+from typing import Optional
+from typing import Union
+
+import aiohttp
+
+from .errors import DeadlineExceededError
+
+_deadline: ContextVar[Optional[float]] = ContextVar('pydantic_aiohttp_deadline', default=None)
+
+
+@dataclasses.dataclass(frozen=True)
+class Timeouts:
+    """
+    Timeouts of single request attempt in seconds, None disables timeout.
+
+    ``connect`` limits establishing of new connection, ``pool`` limits getting connection from pool
+    including establishing it, ``first_byte`` limits waiting for response headers since request started,
+    ``read`` limits waiting for every next chunk of data, ``total`` limits whole request.
+    """
+
+    total: Optional[float] = 300  # Default in aiohttp
+    connect: Optional[float] = None
+    pool: Optional[float] = None
+    first_byte: Optional[float] = None
+    read: Optional[float] = None
+
+    def client_timeout(self, remaining: Optional[float] = None) -> aiohttp.ClientTimeout:
+        """Returns aiohttp timeout with ``total`` shortened to ``remaining`` time before deadline"""
+        if remaining is None:
+            return _cached_client_timeout(self)
+
+        total = remaining if self.total is None else min(self.total, remaining)
+        return _build_client_timeout(dataclasses.replace(self, total=total))
+
+
+# Number is a shortcut for overriding total timeout only
+Timeout = Union[float, Timeouts, None]
+
+
+def _build_client_timeout(timeouts: Timeouts) -> aiohttp.ClientTimeout:
+    return aiohttp.ClientTimeout(
+        total=timeouts.total,
+        connect=timeouts.pool,
+        sock_connect=timeouts.connect,
+        sock_read=timeouts.read,
+    )
+
+
+# Timeouts are frozen, so aiohttp timeout is built once for every distinct combination
+_cached_client_timeout = functools.lru_cache(maxsize=128)(_build_client_timeout)
+
+
+@functools.lru_cache(maxsize=128)
+def resolve_timeouts(default: Timeouts, timeout: Timeout) -> Timeouts:
+    """Applies per-request ``timeout`` override to client ``default`` timeouts"""
+    if timeout is None:
+        return default
+
+    if isinstance(timeout, Timeouts):
+        return timeout
+
+    return dataclasses.replace(default, total=timeout)
+
+
+@contextlib.contextmanager
+def deadline(seconds: float) -> Iterator[float]:
+    """
+    Requests made inside the block, including ones made by tasks created in it, must complete within
+    ``seconds``. Their timeouts are shortened to remaining time and requests started after deadline
+    fail with ``DeadlineExceededError``. Nested deadline may only shorten outer one.
+    """
+    deadline_at = time.monotonic() + seconds
+    current = _deadline.get()
+
+    if current is not None:
+        deadline_at = min(deadline_at, current)
+
+    token = _deadline.set(deadline_at)
+
+    try:
+        yield deadline_at
+    finally:
+        _deadline.reset(token)
+
+
+def get_deadline() -> Optional[float]:
+    """Returns current deadline as ``time.monotonic()`` value or None if there is no deadline"""
+    return _deadline.get()
+
+
+def remaining_time() -> Optional[float]:
+    deadline_at = _deadline.get()
+
+    if deadline_at is None:
+        return None
+
+    return deadline_at - time.monotonic()
+
+
+@contextlib.contextmanager
+def deadline_timeouts() -> Iterator[None]:
+    """Turns timeout caused by deadline passing while request was in flight into ``DeadlineExceededError``"""
+    try:
+        yield
+    except asyncio.TimeoutError as e:
+        remaining = remaining_time()
+
+        # Timer may fire up to clock resolution early
+        if remaining is not None and remaining <= time.get_clock_info('monotonic').resolution:
+            raise DeadlineExceededError('deadline exceeded while request was in flight') from e
+
+        raise
+
+
+def context_with_deadline(deadline_at: Optional[float]) -> contextvars.Context:
+    """
+    Returns copy of current context with deadline replaced by ``deadline_at``, for tasks shared by several callers
+    or outliving the caller, which must not inherit deadline of whichever caller started them
+    """
+    context = contextvars.copy_context()
+    context.run(_deadline.set, deadline_at)
+    return context
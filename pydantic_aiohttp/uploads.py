@@ -0,0 +1,107 @@
+import dataclasses
+import os
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Union
+
+import aiofiles
+import aiofiles.os
+import aiohttp
+from aiohttp.abc import AbstractStreamWriter
+from aiohttp.payload import Payload
+from aiohttp.typedefs import PathLike
+
+from .errors import ClientError
+from .types import Params
+from .utils import DEFAULT_UPLOAD_CHUNK_SIZE
+from .utils import url_encode_mapping
+
+
+@dataclasses.dataclass
+class UploadFile:
+    """File part of multipart upload, ``filename`` defaults to name of file and ``content_type`` is guessed from it"""
+
+    path: PathLike
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
+
+
+UploadFiles = Mapping[str, Union[PathLike, UploadFile, Sequence[Union[PathLike, UploadFile]]]]
+
+
+class FilePayload(Payload):
+    """
+    Reads file with aiofiles by ``chunk_size`` bytes while request is sent. File of known ``size`` is opened only
+    for the duration of every write and closed right after it, so payload holds no descriptor between retries
+    """
+
+    def __init__(self, path: PathLike, *, size: int, chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE, **kwargs):
+        super().__init__(path, **kwargs)
+        self._size = size
+        self._chunk_size = chunk_size
+
+    @classmethod
+    async def from_path(
+            cls,
+            path: PathLike,
+            *,
+            chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+            **kwargs
+    ) -> 'FilePayload':
+        stat = await aiofiles.os.stat(path)
+        return cls(path, size=stat.st_size, chunk_size=chunk_size, **kwargs)
+
+    def decode(self, encoding: str = 'utf-8', errors: str = 'strict') -> str:
+        raise TypeError('file payload is streamed and can not be decoded')
+
+    async def write(self, writer: AbstractStreamWriter):
+        remaining = self._size
+
+        async with aiofiles.open(self._value, 'rb') as f:
+            while remaining > 0:
+                chunk = await f.read(min(self._chunk_size, remaining))
+
+                if not chunk:
+                    # Content-Length was already sent
+                    raise ClientError(f'{os.fspath(self._value)} was truncated while being uploaded')
+
+                await writer.write(chunk)
+                remaining -= len(chunk)
+
+
+async def multipart_body(
+        files: UploadFiles,
+        fields: Optional[Params] = None,
+        *,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+) -> aiohttp.MultipartWriter:
+    """
+    Builds multipart/form-data body of ``fields`` and ``files`` streamed from disk. Sizes of all parts are known
+    up front, so request is sent with Content-Length instead of chunked encoding
+    """
+    writer = aiohttp.MultipartWriter('form-data')
+
+    for name, values in (url_encode_mapping(fields) or {}).items():
+        for value in (values if isinstance(values, list) else [values]):
+            writer.append(value).set_content_disposition('form-data', name=name)
+
+    for name, uploads in files.items():
+        if isinstance(uploads, (str, os.PathLike, UploadFile)):
+            uploads = [uploads]
+
+        for upload in uploads:
+            if not isinstance(upload, UploadFile):
+                upload = UploadFile(upload)
+
+            filename = upload.filename or os.path.basename(os.fspath(upload.path))
+            payload = await FilePayload.from_path(
+                upload.path,
+                chunk_size=chunk_size,
+                filename=filename,
+                content_type=upload.content_type,
+            )
+            payload.set_content_disposition('form-data', name=name, filename=filename)
+            writer.append_payload(payload)
+
+    return writer
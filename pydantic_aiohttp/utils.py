@@ -1,16 +1,23 @@
 from os import PathLike
+from typing import Any
 from typing import Optional
 from typing import Union
 
 import aiofiles
 import pydantic
-import ujson
 
+from .adapters import get_type_adapter
 from .encoders import IncEx
 from .encoders import jsonable_encoder
+from .encoders import url_compatible_encoder
+from .json_backends import JSONBackend
+from .json_backends import get_default_json_backend
 
 DEFAULT_DOWNLOAD_CHUNK_SIZE = 64 * 1024  # 128KB
-DEFAULT_UPLOAD_CHUNK_SIZE = 64 * 1024  # 64KB
+DEFAULT_UPLOAD_CHUNK_SIZE = 256 * 1024  # 256KB
+# Parallel downloads do not split files into ranges smaller than this
+DEFAULT_DOWNLOAD_PART_SIZE = 8 * 1024 * 1024  # 8MB
+DEFAULT_WRITE_BATCH_SIZE = 8 * 1024 * 1024  # 8MB
 
 
 async def read_file_by_chunk(file: Union[str, PathLike[str]], chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE):
@@ -43,5 +50,53 @@ def model_to_dict(
     )
 
 
-def json_serialize(o, *args, **kwargs):
-    return ujson.dumps(jsonable_encoder(o), *args, **kwargs)
+def url_encode_mapping(value: Union[dict, pydantic.BaseModel, None]) -> Optional[dict]:
+    if value is None:
+        # Skip encoders entirely on the hot path
+        return None
+
+    return url_compatible_encoder(model_to_dict(value))
+
+
+def is_replayable(data: Any) -> bool:
+    """Whether request data could be sent again, streams and file objects are consumed by the first attempt"""
+    if data is None or isinstance(data, (bytes, bytearray, str)):
+        return True
+
+    if isinstance(data, dict):
+        return all(isinstance(value, (bytes, str, int, float)) for value in data.values())
+
+    return False
+
+
+def json_serialize(o, *, json_backend: JSONBackend = None) -> str:
+    # Values which backend can not serialize natively are passed through jsonable_encoder lazily,
+    # so no intermediate copy of the whole object is built
+    json_backend = json_backend or get_default_json_backend()
+    return json_backend.dumps(o, default=jsonable_encoder).decode()
+
+
+_body_type_adapters: dict[type, pydantic.TypeAdapter] = {}
+
+
+def register_body_type(type_: type) -> pydantic.TypeAdapter:
+    """
+    Registers a type (dataclass, TypedDict based class, etc.) whose instances are serialized
+    with ``TypeAdapter.dump_json`` when passed as request body
+    """
+    adapter = _body_type_adapters[type_] = get_type_adapter(type_)
+    return adapter
+
+
+def encode_body(body: Any, *, json_backend: JSONBackend = None) -> bytes:
+    if isinstance(body, pydantic.BaseModel):
+        # Same defaults as model_to_dict
+        return body.model_dump_json(exclude_unset=True).encode()
+
+    adapter = _body_type_adapters.get(type(body))
+
+    if adapter is not None:
+        return adapter.dump_json(body)
+
+    json_backend = json_backend or get_default_json_backend()
+    return json_backend.dumps(body, default=model_to_dict)
@@ -0,0 +1,66 @@
+import asyncio
+import collections
+import contextlib
+from typing import AsyncIterator
+
+import pytest
+from aiohttp import web
+
+from pydantic_aiohttp import AdaptiveConcurrencyLimiter
+from pydantic_aiohttp import BalancingStrategy
+from pydantic_aiohttp import Client
+from pydantic_aiohttp import JSONResponseClass
+from pydantic_aiohttp import LoadBalancer
+
+
+@contextlib.asynccontextmanager
+async def serve(count: int, hits: collections.Counter) -> AsyncIterator[list[str]]:
+    runners = []
+
+    for index in range(count):
+        async def handle(request: web.Request, index: int = index) -> web.Response:
+            hits[index] += 1
+            await asyncio.sleep(0.01)
+            return web.json_response({'ok': True})
+
+        app = web.Application()
+        app.router.add_get('/resource', handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', 0).start()
+        runners.append(runner)
+
+    try:
+        yield [f'http://127.0.0.1:{runner.addresses[0][1]}' for runner in runners]
+    finally:
+        for runner in runners:
+            await runner.cleanup()
+
+
+@pytest.mark.parametrize('strategy', [BalancingStrategy.LEAST_OUTSTANDING, BalancingStrategy.P2C_EWMA])
+def test_reserved_endpoints_count_as_outstanding(strategy):
+    balancer = LoadBalancer(['http://a', 'http://b'], strategy=strategy)
+
+    with contextlib.ExitStack() as stack:
+        endpoints = {stack.enter_context(balancer.reserve()).url.host for _ in range(2)}
+        assert endpoints == {'a', 'b'}
+        assert [endpoint.outstanding for endpoint in balancer.endpoints] == [1, 1]
+
+    assert [endpoint.outstanding for endpoint in balancer.endpoints] == [0, 0]
+
+
+def test_queued_requests_are_spread_across_endpoints():
+    hits = collections.Counter()
+
+    async def scenario():
+        async with serve(2, hits) as base_urls:
+            async with Client(
+                    response_class=JSONResponseClass,
+                    load_balancer=LoadBalancer(base_urls, strategy=BalancingStrategy.LEAST_OUTSTANDING),
+                    concurrency_limiter=AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1),
+            ) as client:
+                await asyncio.gather(*(client.get('/resource') for _ in range(8)))
+
+    asyncio.run(scenario())
+
+    assert hits == {0: 4, 1: 4}
@@ -0,0 +1,80 @@
+import asyncio
+import contextlib
+from typing import AsyncIterator
+
+import pytest
+from aiohttp import web
+
+from pydantic_aiohttp import Client
+from pydantic_aiohttp import JSONResponseClass
+from pydantic_aiohttp import MemoryCacheBackend
+from pydantic_aiohttp import ResponseCache
+from pydantic_aiohttp import SQLiteCacheBackend
+
+
+class RevalidatedServer:
+    """Local stand-in answering conditional requests with 304 and given ``not_modified_headers``"""
+
+    def __init__(self, headers: dict, not_modified_headers: dict = None):
+        self.headers = headers
+        self.not_modified_headers = not_modified_headers or {}
+        self.requests: list[str] = []
+        self.version = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        if request.headers.get('If-None-Match') == '"v1"':
+            self.requests.append('conditional')
+            return web.Response(status=304, headers=self.not_modified_headers)
+
+        self.requests.append('full')
+        self.version += 1
+        return web.json_response({'version': self.version}, headers={'ETag': '"v1"', **self.headers})
+
+    @contextlib.asynccontextmanager
+    async def serve(self) -> AsyncIterator[str]:
+        app = web.Application()
+        app.router.add_get('/resource', self.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+
+        try:
+            yield f'http://127.0.0.1:{runner.addresses[0][1]}'
+        finally:
+            await runner.cleanup()
+
+
+async def get_many(server: RevalidatedServer, count: int) -> list:
+    async with server.serve() as base_url:
+        async with Client(base_url, response_class=JSONResponseClass, cache=ResponseCache()) as client:
+            return [await client.get('/resource') for _ in range(count)]
+
+
+def test_not_modified_varying_on_everything_is_requested_again():
+    server = RevalidatedServer({'Cache-Control': 'no-cache'}, {'Vary': '*'})
+
+    assert asyncio.run(get_many(server, 2)) == [{'version': 1}, {'version': 2}]
+    assert server.requests == ['full', 'conditional', 'full']
+
+
+@pytest.mark.parametrize('backend', ['memory', 'sqlite'])
+def test_not_modified_without_freshness_headers_keeps_stored_freshness(backend, tmp_path):
+    server = RevalidatedServer({'Cache-Control': 'max-age=60'})
+
+    async def scenario():
+        cache_backend = MemoryCacheBackend() if backend == 'memory' else SQLiteCacheBackend(tmp_path / 'cache.db')
+
+        async with server.serve() as base_url:
+            async with Client(
+                    base_url,
+                    response_class=JSONResponseClass,
+                    cache=ResponseCache(cache_backend),
+            ) as client:
+                await client.get('/resource')
+                await client.request('GET', '/resource', revalidate=True)
+
+                return [await client.get('/resource') for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [{'version': 1}] * 3
+    assert server.requests == ['full', 'conditional']
@@ -0,0 +1,52 @@
+import asyncio
+import contextlib
+from typing import AsyncIterator
+
+import pytest
+from aiohttp import web
+
+from pydantic_aiohttp import Client
+from pydantic_aiohttp import DeadlineExceededError
+from pydantic_aiohttp import JSONResponseClass
+from pydantic_aiohttp import deadline
+
+
+@contextlib.asynccontextmanager
+async def serve_slowly(delay: float) -> AsyncIterator[str]:
+    async def handle(request: web.Request) -> web.Response:
+        await asyncio.sleep(delay)
+        return web.json_response({'ok': True})
+
+    app = web.Application()
+    app.router.add_get('/resource', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', 0).start()
+
+    try:
+        yield f'http://127.0.0.1:{runner.addresses[0][1]}'
+    finally:
+        await runner.cleanup()
+
+
+def test_deadline_passing_in_flight_raises_deadline_exceeded():
+    async def scenario():
+        async with serve_slowly(0.5) as base_url:
+            async with Client(base_url, response_class=JSONResponseClass) as client:
+                with deadline(0.1):
+                    await asyncio.gather(client.get('/resource'), client.get('/resource'))
+
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(scenario())
+
+
+def test_timeout_without_deadline_is_not_converted():
+    async def scenario():
+        async with serve_slowly(0.5) as base_url:
+            async with Client(base_url, response_class=JSONResponseClass) as client:
+                await client.get('/resource', timeout=0.1)
+
+    with pytest.raises(asyncio.TimeoutError) as error:
+        asyncio.run(scenario())
+
+    assert not isinstance(error.value, DeadlineExceededError)
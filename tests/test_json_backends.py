@@ -0,0 +1,56 @@
+import datetime
+import enum
+import uuid
+from decimal import Decimal
+from typing import Optional
+
+import pydantic
+import pytest
+import ujson
+
+from pydantic_aiohttp.encoders import jsonable_encoder
+from pydantic_aiohttp.json_backends import JSONBackend
+from pydantic_aiohttp.json_backends import available_json_backends
+from pydantic_aiohttp.utils import encode_body
+from pydantic_aiohttp.utils import json_serialize
+from pydantic_aiohttp.utils import model_to_dict
+
+
+class Color(enum.Enum):
+    RED = 'red'
+
+
+class Item(pydantic.BaseModel):
+    name: str
+    price: Decimal
+    note: Optional[str] = None
+
+
+BODY = {
+    'bytes': b'hello',
+    'timedelta': datetime.timedelta(seconds=90),
+    'decimals': [Decimal('2.50'), Decimal('3')],
+    'datetime': datetime.datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+    'naive_datetime': datetime.datetime(2024, 1, 2, 3, 4, 5),
+    'date': datetime.date(2024, 1, 2),
+    'time': datetime.time(3, 4, tzinfo=datetime.timezone.utc),
+    'uuid': uuid.UUID(int=1),
+    'enum': Color.RED,
+    'big_ints': [2 ** 64, -2 ** 63 - 1],
+    'set': {1},
+    'tuple': (1, 2.5, None, True),
+    'int_keys': {1: 'one'},
+    'item': Item(name='chair', price=Decimal('9.99')),
+}
+
+
+@pytest.mark.parametrize('json_backend', available_json_backends(), ids=lambda backend: backend.name)
+def test_body_is_encoded_as_with_jsonable_encoder(json_backend: JSONBackend):
+    assert encode_body(BODY, json_backend=json_backend) == ujson.dumps(model_to_dict(BODY)).encode()
+    assert json_serialize(BODY, json_backend=json_backend) == ujson.dumps(jsonable_encoder(BODY))
+
+
+@pytest.mark.parametrize('json_backend', available_json_backends(), ids=lambda backend: backend.name)
+def test_native_body_skips_jsonable_encoder(json_backend: JSONBackend):
+    assert json_backend.is_native({'name': 'chair', 'tags': ['a', 'b'], 'price': 9.99, 'stock': None})
+    assert not json_backend.is_native({'name': 'chair', 'price': Decimal('9.99')})
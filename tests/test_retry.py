@@ -0,0 +1,154 @@
+import asyncio
+import contextlib
+import time
+from typing import AsyncIterator
+
+import pytest
+from aiohttp import web
+
+from pydantic_aiohttp import Client
+from pydantic_aiohttp import HTTPServiceUnavailable
+from pydantic_aiohttp import JSONResponseClass
+from pydantic_aiohttp import RetryBudget
+from pydantic_aiohttp import RetryPolicy
+
+
+class FlakyServer:
+    """Local stand-in answering with ``failures`` error responses before succeeding"""
+
+    def __init__(self, failures: int, *, status: int = 503, headers: dict = None, json: bool = True):
+        self.failures = failures
+        self.status = status
+        self.headers = headers or {}
+        self.json = json
+        self.calls: list[float] = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.calls.append(time.monotonic())
+
+        if len(self.calls) > self.failures:
+            return web.json_response({'ok': True})
+
+        if self.json:
+            return web.json_response({'detail': 'unavailable'}, status=self.status, headers=self.headers)
+
+        return web.Response(text='<html>unavailable</html>', status=self.status, headers=self.headers)
+
+    @contextlib.asynccontextmanager
+    async def serve(self) -> AsyncIterator[str]:
+        app = web.Application()
+        app.router.add_route('*', '/resource', self.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+
+        try:
+            yield f'http://127.0.0.1:{runner.addresses[0][1]}'
+        finally:
+            await runner.cleanup()
+
+
+async def request(server: FlakyServer, method: str = 'GET', **client_kwargs):
+    async with server.serve() as base_url:
+        async with Client(base_url, response_class=JSONResponseClass, **client_kwargs) as client:
+            return await client.request(method, '/resource')
+
+
+def test_backoff_is_exponential_and_capped():
+    policy = RetryPolicy(backoff_base=0.1, backoff_max=0.5, jitter=False)
+
+    assert [policy.get_delay(retry, Exception()) for retry in range(5)] == [0.1, 0.2, 0.4, 0.5, 0.5]
+
+
+def test_jitter_stays_below_backoff():
+    policy = RetryPolicy(backoff_base=0.1, backoff_max=0.5)
+
+    for retry in range(5):
+        assert 0 <= policy.get_delay(retry, Exception()) <= min(0.5, 0.1 * 2 ** retry)
+
+
+def test_retries_with_backoff_until_success():
+    server = FlakyServer(failures=2)
+    policy = RetryPolicy(attempts=3, backoff_base=0.05, jitter=False)
+
+    assert asyncio.run(request(server, retry_policy=policy)) == {'ok': True}
+    assert len(server.calls) == 3
+
+    gaps = [later - earlier for earlier, later in zip(server.calls, server.calls[1:])]
+    assert gaps[0] >= 0.05
+    assert gaps[1] >= 0.1
+
+
+def test_gives_up_after_attempts():
+    server = FlakyServer(failures=5)
+
+    with pytest.raises(HTTPServiceUnavailable):
+        asyncio.run(request(server, retry_policy=RetryPolicy(attempts=3, backoff_base=0.01)))
+
+    assert len(server.calls) == 3
+
+
+def test_retry_after_is_honoured():
+    server = FlakyServer(failures=1, headers={'Retry-After': '0.3'})
+    policy = RetryPolicy(attempts=2, backoff_base=0.001)
+
+    assert asyncio.run(request(server, retry_policy=policy)) == {'ok': True}
+    assert server.calls[1] - server.calls[0] >= 0.3
+
+
+def test_too_long_retry_after_is_not_waited_for():
+    server = FlakyServer(failures=1, headers={'Retry-After': '120'})
+
+    with pytest.raises(HTTPServiceUnavailable):
+        asyncio.run(request(server, retry_policy=RetryPolicy(attempts=2, max_retry_after=60)))
+
+    assert len(server.calls) == 1
+
+
+def test_unparsable_error_response_is_retried_by_status():
+    server = FlakyServer(failures=1, json=False)
+
+    assert asyncio.run(request(server, retry_policy=RetryPolicy(attempts=2, backoff_base=0.01))) == {'ok': True}
+    assert len(server.calls) == 2
+
+
+def test_post_is_not_retried_by_default():
+    server = FlakyServer(failures=1)
+
+    with pytest.raises(HTTPServiceUnavailable):
+        asyncio.run(request(server, 'POST', retry_policy=RetryPolicy(attempts=3, backoff_base=0.01)))
+
+    assert len(server.calls) == 1
+
+
+def test_post_is_retried_when_asked():
+    server = FlakyServer(failures=1)
+    policy = RetryPolicy(attempts=3, backoff_base=0.01, retry_non_idempotent=True)
+
+    assert asyncio.run(request(server, 'POST', retry_policy=policy)) == {'ok': True}
+    assert len(server.calls) == 2
+
+
+def test_retry_budget_limits_retries():
+    server = FlakyServer(failures=100)
+    # Budget allows a single retry within its window
+    budget = RetryBudget(0, min_retries_per_second=0.1, ttl=10)
+    policy = RetryPolicy(attempts=5, backoff_base=0.01)
+
+    async def scenario():
+        async with server.serve() as base_url:
+            async with Client(
+                    base_url,
+                    response_class=JSONResponseClass,
+                    retry_policy=policy,
+                    retry_budget=budget,
+            ) as client:
+                for _ in range(2):
+                    with pytest.raises(HTTPServiceUnavailable):
+                        await client.get('/resource')
+
+    asyncio.run(scenario())
+
+    # First request is retried once, then budget is exhausted and second one is not retried at all
+    assert len(server.calls) == 3
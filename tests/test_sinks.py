@@ -0,0 +1,40 @@
+import asyncio
+import gc
+
+import pytest
+
+from pydantic_aiohttp import FileSink
+from pydantic_aiohttp import sinks
+
+
+def test_failed_open_shuts_writer_down(tmp_path):
+    sink = FileSink(tmp_path / 'missing' / 'file.bin')
+
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(sink.open())
+
+    assert sink._executor is None
+
+
+def test_abort_retrieves_errors_of_pending_writes(tmp_path, monkeypatch):
+    def fail(fd: int, data: bytes, position: int):
+        raise OSError('disk is full')
+
+    monkeypatch.setattr(sinks, '_write_all', fail)
+    unretrieved = []
+
+    async def scenario():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unretrieved.append(context))
+        sink = FileSink(tmp_path / 'file.bin', batch_size=1, max_pending_writes=4)
+        await sink.open()
+
+        for chunk in (b'a', b'b', b'c'):
+            await sink.write(chunk)
+
+        await sink.abort()
+        gc.collect()
+
+    asyncio.run(scenario())
+
+    assert (tmp_path / 'file.bin').exists()
+    assert unretrieved == []